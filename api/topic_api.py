@@ -1,15 +1,30 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, File, UploadFile, Form
-from app.models.topic_models import QueryRequest, Topic, TopicResponse, InputType, TextInput
-from app.services.qdrant_service import QdrantService
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Query, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.models.topic_models import (
+    QueryRequest, Topic, TopicResponse, InputType, TextInput, TopicFilter, BatchUrlRequest, BatchTopicResponse, JobResponse
+)
 from app.services.topic_service import TopicService
-import base64
+from app.services.qdrant_service import QdrantService
+from app.services.job_service import JobService
+from app.config import PDF_EXTRACT_TABLES
+import json
+import os
 import logging
 import asyncio
 
 router = APIRouter(prefix="/api/v1/topics")
-topic_service = TopicService()
-qdrant_service = QdrantService()
+
+# Services are built once in the app lifespan and kept on app.state, so importing
+# this module stays cheap and tests or benchmarks can install their own
+def get_topic_service(request: Request) -> TopicService:
+    return request.app.state.topic_service
+
+def get_qdrant_service(request: Request) -> QdrantService:
+    return request.app.state.topic_service.qdrant_service
+
+def get_job_service(request: Request) -> JobService:
+    return request.app.state.job_service
 
 async def run_in_thread(func, *args, **kwargs):
     """Run a function in a separate thread."""
@@ -18,6 +33,8 @@ async def run_in_thread(func, *args, **kwargs):
 @router.post("/extract-from-text", response_model=TopicResponse)
 async def extract_topics_from_text(
     content: str = Form(...),
+    timings: bool = Query(False, description="Include seconds spent per pipeline stage"),
+    topic_service: TopicService = Depends(get_topic_service)
 ):
     """
     Extract concepts from plain text input
@@ -27,7 +44,7 @@ async def extract_topics_from_text(
             input_type=InputType.TEXT,
             content=content
         )
-        response = await topic_service.process_input(input_data)  # Await the async function
+        response = await topic_service.process_input(input_data, include_timings=timings)
         return response
     except Exception as e:
         logging.error(f"Error processing input: {str(e)}", exc_info=True)
@@ -35,7 +52,9 @@ async def extract_topics_from_text(
 
 @router.post("/extract-from-url", response_model=TopicResponse)
 async def extract_topics_from_url(
-    url: str = Form(...)
+    url: str = Form(...),
+    timings: bool = Query(False, description="Include seconds spent per pipeline stage"),
+    topic_service: TopicService = Depends(get_topic_service)
 ):
     """
     Extract concepts from URL input
@@ -45,40 +64,196 @@ async def extract_topics_from_url(
             input_type=InputType.URL,
             content=url
         )
-        response = await topic_service.process_input(input_data)  # Await the async function
+        response = await topic_service.process_input(input_data, include_timings=timings)
         return response
     except Exception as e:
         logging.error(f"Error processing input: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/extract-from-urls", response_model=BatchTopicResponse)
+async def extract_topics_from_urls(
+    request: BatchUrlRequest,
+    topic_service: TopicService = Depends(get_topic_service)
+):
+    """
+    Extract concepts from many URLs concurrently, with a result or error per URL
+    """
+    try:
+        results = await topic_service.process_urls(request.urls)
+        succeeded = sum(1 for result in results if result.status == "success")
+        if succeeded == len(results):
+            status = "success"
+        elif succeeded:
+            status = "partial_error"
+        else:
+            status = "error"
+        return BatchTopicResponse(
+            results=results,
+            message=f"Processed {len(results)} URLs, {succeeded} succeeded",
+            status=status
+        )
+    except Exception as e:
+        logging.error(f"Error processing URL batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/extract-from-pdf", response_model=TopicResponse)
 async def extract_topics_from_pdf(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    extract_tables: bool = Form(PDF_EXTRACT_TABLES),
+    timings: bool = Query(False, description="Include seconds spent per pipeline stage"),
+    topic_service: TopicService = Depends(get_topic_service)
 ):
     """
-    Extract concepts from PDF file including tables and images
+    Extract concepts from PDF file including images and tables; set extract_tables=false to skip tables
     """
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
     try:
         contents = await file.read()
-        pdf_base64 = base64.b64encode(contents).decode() 
         
         input_data = TextInput(
             input_type=InputType.PDF,
-            content=pdf_base64
+            content=file.filename,
+            data=contents,
+            extract_tables=extract_tables
         )
         
-        response = await topic_service.process_input(input_data)  # Await the async function
+        response = await topic_service.process_input(input_data, include_timings=timings)
         return response
     except Exception as e:
         logging.error(f"Error processing PDF input: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _event_stream(events: AsyncIterator[Dict], format: str) -> StreamingResponse:
+    """Serialize extraction events as server-sent events or NDJSON."""
+    async def generate():
+        async for event in events:
+            if format == "ndjson":
+                yield json.dumps(event) + "\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    # Disable proxy buffering so each event reaches the client as soon as it is written
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(generate(), media_type=media_type, headers=headers)
+
+@router.post("/extract-from-text/stream")
+async def stream_topics_from_text(
+    content: str = Form(...),
+    format: str = Query("sse", pattern="^(sse|ndjson)$"),
+    topic_service: TopicService = Depends(get_topic_service)
+):
+    """
+    Stream concepts from plain text as each chunk finishes, ending with a deduplicated summary
+    """
+    input_data = TextInput(input_type=InputType.TEXT, content=content)
+    return _event_stream(topic_service.stream_input(input_data), format)
+
+@router.post("/extract-from-url/stream")
+async def stream_topics_from_url(
+    url: str = Form(...),
+    format: str = Query("sse", pattern="^(sse|ndjson)$"),
+    topic_service: TopicService = Depends(get_topic_service)
+):
+    """
+    Stream concepts from a URL as each chunk finishes, ending with a deduplicated summary
+    """
+    input_data = TextInput(input_type=InputType.URL, content=url)
+    return _event_stream(topic_service.stream_input(input_data), format)
+
+@router.post("/extract-from-pdf/stream")
+async def stream_topics_from_pdf(
+    file: UploadFile = File(...),
+    extract_tables: bool = Form(PDF_EXTRACT_TABLES),
+    format: str = Query("sse", pattern="^(sse|ndjson)$"),
+    topic_service: TopicService = Depends(get_topic_service)
+):
+    """
+    Stream concepts from a PDF as each chunk, table or image finishes, ending with a deduplicated summary
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+
+    contents = await file.read()
+    input_data = TextInput(
+        input_type=InputType.PDF,
+        content=file.filename,
+        data=contents,
+        extract_tables=extract_tables
+    )
+    return _event_stream(topic_service.stream_input(input_data), format)
+
+@router.post("/jobs/extract-from-text", response_model=JobResponse, status_code=202)
+async def submit_text_job(
+    content: str = Form(...),
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Queue concept extraction from plain text and return a job id to poll
+    """
+    return await job_service.submit(TextInput(input_type=InputType.TEXT, content=content))
+
+@router.post("/jobs/extract-from-url", response_model=JobResponse, status_code=202)
+async def submit_url_job(
+    url: str = Form(...),
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Queue concept extraction from a URL and return a job id to poll
+    """
+    return await job_service.submit(TextInput(input_type=InputType.URL, content=url))
+
+@router.post("/jobs/extract-from-pdf", response_model=JobResponse, status_code=202)
+async def submit_pdf_job(
+    file: UploadFile = File(...),
+    extract_tables: bool = Form(PDF_EXTRACT_TABLES),
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Queue concept extraction from a PDF file and return a job id to poll
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+
+    contents = await file.read()
+    return await job_service.submit(TextInput(
+        input_type=InputType.PDF,
+        content=file.filename,
+        data=contents,
+        extract_tables=extract_tables
+    ))
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Return a job's status, progress (chunks done / total) and, once finished, its result
+    """
+    job = await job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Delete a finished job and its stored result
+    """
+    if not await job_service.delete(job_id):
+        raise HTTPException(status_code=404, detail="No finished job with this id")
+    return {"status": "success", "message": f"Job '{job_id}' deleted"}
+
 @router.post("/store-selected-topics", response_model=TopicResponse)
 async def store_selected_topics(
-    selected_topics: List[Topic]
+    selected_topics: List[Topic],
+    topic_service: TopicService = Depends(get_topic_service)
 ):
     """Store selected topics in the database."""
     try:
@@ -94,7 +269,8 @@ async def store_selected_topics(
 
 @router.delete("/reject-topics", response_model=TopicResponse)
 async def reject_topics(
-    topics_to_reject: List[str]
+    topics_to_reject: List[str],
+    topic_service: TopicService = Depends(get_topic_service)
 ):
     """Reject topics and remove them from consideration."""
     try:
@@ -109,12 +285,20 @@ async def reject_topics(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/ask-question", response_model=TopicResponse)
-async def ask_question(request: QueryRequest):
+async def ask_question(
+    request: QueryRequest,
+    qdrant_service: QdrantService = Depends(get_qdrant_service)
+):
     """
     Respond to user questions based on stored topics in the database.
     """
-    query = request.query
-    topics = await qdrant_service.query_topics(query)  # Await the async function
+    filters = TopicFilter(**request.model_dump(include=set(TopicFilter.model_fields)))
+    topics = await qdrant_service.query_topics(
+        request.query,
+        filters=filters,
+        limit=request.limit,
+        score_threshold=request.score_threshold
+    )
     
     if not topics:
         return TopicResponse(
@@ -129,18 +313,58 @@ async def ask_question(request: QueryRequest):
         status="success"
     )
 
+@router.get("/cache-stats")
+async def cache_stats(
+    topic_service: TopicService = Depends(get_topic_service),
+    qdrant_service: QdrantService = Depends(get_qdrant_service)
+):
+    """
+    Report hit rates for the extraction, embedding, query and fetch caches, and ask-question latency.
+
+    The caches belong to the worker process that answered, identified by pid.
+    """
+    return {
+        "pid": os.getpid(),
+        "topics": topic_service.openai_service.cache.stats(),
+        "embeddings": topic_service.embedding_service.cache.stats(),
+        **qdrant_service.cache_stats(),
+        "fetch": topic_service.content_service.http_fetcher.cache.stats()
+    }
+
 @router.get("/get-all-topics", response_model=TopicResponse)
-async def get_all_topics():
+async def get_all_topics(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: Optional[str] = Query(None, description="next_offset from the previous page"),
+    filters: TopicFilter = Depends(),
+    qdrant_service: QdrantService = Depends(get_qdrant_service)
+):
     """
-    Retrieve all topics from the database, sorted by most recently stored first.
+    Retrieve a page of topics from the database, sorted by most recently stored first.
     """
     try:
-        topics = await qdrant_service.get_all_topics()  # Await the async function
+        topics, next_offset = await qdrant_service.get_topics_page(limit, offset, filters)
         return TopicResponse(
             topics=topics,
-            message="Successfully retrieved all topics",
-            status="success"
+            message="Successfully retrieved topics",
+            status="success",
+            next_offset=next_offset
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error retrieving topics: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export-topics")
+async def export_topics(
+    filters: TopicFilter = Depends(),
+    qdrant_service: QdrantService = Depends(get_qdrant_service)
+):
+    """
+    Stream every matching topic as NDJSON, one topic per line, as pages arrive from the database.
+    """
+    async def generate():
+        async for topic in qdrant_service.iter_topics(filters):
+            yield topic.model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
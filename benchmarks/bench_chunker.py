@@ -0,0 +1,61 @@
+"""Compare TextChunker throughput across chunking modes on a multi-MB text.
+
+Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_chunker --size-mb 4
+"""
+import argparse
+import random
+import time
+from app.utils.text_chunker import CHUNKER_MODES, TextChunker
+
+WORDS = (
+    "quantum computing model neural network data privacy edge device battery "
+    "cloud latency vector search robotics genome climate sensor market energy "
+    "regulation startup protocol open source inference training benchmark"
+).split()
+
+def generate_text(size_bytes: int, seed: int = 0) -> str:
+    """Generate paragraphs of pseudo-English sentences totalling about size_bytes."""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_bytes:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = rng.choices(WORDS, k=rng.randint(6, 30))
+            sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+        paragraph = " ".join(sentences)
+        parts.append(paragraph)
+        total += len(paragraph) + 2
+    return "\n\n".join(parts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", default=list(CHUNKER_MODES), choices=CHUNKER_MODES)
+    args = parser.parse_args()
+
+    text = generate_text(int(args.size_mb * 1024 * 1024))
+    print(f"Input: {len(text) / 1024 / 1024:.2f} MB")
+    print(f"{'mode':<12} {'load s':>8} {'chunk s':>9} {'MB/s':>8} {'chunks':>8}")
+
+    for mode in args.modes:
+        try:
+            start = time.perf_counter()
+            # Warm the pipeline on a small input so load time is reported separately
+            TextChunker.chunk_text("Warm up.", args.chunk_size, mode=mode)
+            load_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            chunks = TextChunker.chunk_text(text, args.chunk_size, mode=mode)
+            elapsed = time.perf_counter() - start
+        except (ImportError, OSError) as e:
+            print(f"{mode:<12} skipped: {e}")
+            continue
+        throughput = len(text) / 1024 / 1024 / elapsed
+        print(f"{mode:<12} {load_seconds:>8.2f} {elapsed:>9.2f} {throughput:>8.2f} {len(chunks):>8}")
+
+if __name__ == "__main__":
+    main()
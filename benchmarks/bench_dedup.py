@@ -0,0 +1,99 @@
+"""Time semantic near-duplicate suppression on 1,000+ candidate topics.
+
+Two measurements per size:
+- suppress only: synthetic unit vectors (MiniLM dimension) where a share of
+  them are noisy copies of others, standing in for LLM paraphrases.
+- embed + suppress: what a request pays. Candidate titles, a share of them
+  reworded copies of others, are batch-embedded with a cold cache, then
+  suppressed. Embeddings are hash vectors unless --embeddings model is
+  given, which loads the configured model.
+Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_dedup --sizes 1000 2000 5000
+    python -m app.benchmarks.bench_dedup --sizes 1000 2000 --embeddings model
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+import numpy as np
+from app.benchmarks.bench_chunker import WORDS
+from app.benchmarks.fakes import HashEmbeddingService
+from app.utils.similarity import suppress_near_duplicates
+
+# Words a rewording adds to an existing title
+FILLERS = ["new", "future", "rise", "era", "next"]
+
+def make_candidates(count: int, dim: int, duplicate_share: float, noise: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    originals = max(1, int(count * (1 - duplicate_share)))
+    base = rng.standard_normal((originals, dim)).astype(np.float32)
+    sources = np.concatenate([np.arange(originals), rng.integers(0, originals, count - originals)])
+    vectors = base[sources] + noise * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = rng.integers(1, 4, count) * 100 + rng.integers(0, 11, count)
+    return vectors, scores, originals
+
+def make_titles(count: int, duplicate_share: float, seed: int = 0) -> Tuple[List[str], List[float], int]:
+    """Distinct titles plus reworded copies of them: same words reordered, with one filler added."""
+    rng = random.Random(seed)
+    originals = max(1, int(count * (1 - duplicate_share)))
+    titles = [" ".join(rng.sample(WORDS, 5)).title() for _ in range(originals)]
+    for _ in range(count - originals):
+        words = rng.choice(titles[:originals]).split()
+        rng.shuffle(words)
+        titles.append(" ".join(words + [rng.choice(FILLERS).title()]))
+    scores = [rng.randint(1, 3) * 100 + rng.randint(0, 10) for _ in range(count)]
+    return titles, scores, originals
+
+def time_embed_and_suppress(embedding_service, titles: List[str], scores: List[float], threshold: float):
+    """Embed the titles in one batch with an empty cache, then suppress; returns (kept, embed ms, suppress ms)."""
+    embedding_service.cache.clear()
+    start = time.perf_counter()
+    vectors = embedding_service.encode_many(titles)
+    embedded = time.perf_counter()
+    kept = suppress_near_duplicates(vectors, scores, threshold)
+    return kept, (embedded - start) * 1000, (time.perf_counter() - embedded) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 2000, 5000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--duplicate-share", type=float, default=0.4)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--embeddings", choices=["hash", "model"], default="hash")
+    args = parser.parse_args()
+
+    print("Suppress only, synthetic vectors:")
+    print(f"{'candidates':>10} {'originals':>10} {'kept':>6} {'best ms':>9} {'mean ms':>9}")
+    for size in args.sizes:
+        vectors, scores, originals = make_candidates(size, args.dim, args.duplicate_share, noise=0.02)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            kept = suppress_near_duplicates(vectors, scores, args.threshold)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{size:>10} {originals:>10} {len(kept):>6} {min(timings):>9.1f} {sum(timings) / len(timings):>9.1f}")
+
+    if args.embeddings == "hash":
+        embedding_service = HashEmbeddingService(args.dim)
+    else:
+        from app.services.embedding_service import EmbeddingService
+        embedding_service = EmbeddingService()
+        # Load the model before timing; the first encode also pays its one-off setup
+        embedding_service.encode("warm up")
+
+    print(f"\nEmbed + suppress, {args.embeddings} embeddings (best of {args.repeat}):")
+    print(f"{'candidates':>10} {'originals':>10} {'kept':>6} {'embed ms':>9} {'dedup ms':>9} {'total ms':>9}")
+    for size in args.sizes:
+        titles, scores, originals = make_titles(size, args.duplicate_share)
+        runs = [time_embed_and_suppress(embedding_service, titles, scores, args.threshold) for _ in range(args.repeat)]
+        kept, embed_ms, suppress_ms = min(runs, key=lambda run: run[1] + run[2])
+        print(
+            f"{size:>10} {originals:>10} {len(kept):>6} {embed_ms:>9.1f} {suppress_ms:>9.1f} "
+            f"{embed_ms + suppress_ms:>9.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
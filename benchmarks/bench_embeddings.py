@@ -0,0 +1,95 @@
+"""Compare the embedding backends: parity with torch and encodes per second.
+
+Each backend embeds the same generated sentences. The ONNX backends must
+match the torch vectors: the lowest cosine similarity between a text's two
+vectors has to reach the backend's tolerance, or the script exits with an
+error. Throughput is measured on the CPU at each batch size. Run from the
+directory containing the app package:
+
+    python -m app.benchmarks.bench_embeddings --backends torch onnx onnx-int8 --batch-sizes 1 32 256
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from typing import Dict, List
+import numpy as np
+from app.benchmarks.bench_chunker import generate_text
+from app.config import EMBEDDING_MODEL
+from app.services.embedding_provider import BACKENDS, get_embedding_model, loaded_models
+
+# Lowest acceptable cosine similarity to the torch vector of the same text
+TOLERANCE = {"onnx": 0.9999, "onnx-int8": 0.98}
+
+def make_sentences(count: int, seed: int = 0) -> List[str]:
+    sentences = []
+    while len(sentences) < count:
+        text = generate_text(count * 80, seed + len(sentences))
+        sentences.extend(s for s in re.split(r"(?<=[.!?])\s+", text) if s)
+    return sentences[:count]
+
+def encode(model, texts: List[str], batch_size: int) -> np.ndarray:
+    # Same options as EmbeddingService.encode_many
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+def throughput(model, texts: List[str], batch_size: int, min_seconds: float) -> float:
+    """Texts encoded per second, repeating the run until it lasts at least min_seconds."""
+    encode(model, texts[:batch_size], batch_size)
+    encoded, started = 0, time.perf_counter()
+    while True:
+        for start in range(0, len(texts), batch_size):
+            encode(model, texts[start:start + batch_size], batch_size)
+        encoded += len(texts)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return encoded / elapsed
+
+def parity(reference: np.ndarray, vectors: np.ndarray) -> Dict[str, float]:
+    cosine = np.sum(reference * vectors, axis=1)
+    return {"min_cosine": round(float(cosine.min()), 6), "mean_cosine": round(float(cosine.mean()), 6)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 32, 256])
+    parser.add_argument("--texts", type=int, default=512, help="Sentences per throughput run")
+    parser.add_argument("--parity-texts", type=int, default=256, help="Sentences compared against torch")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Minimum measured time per batch size")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    texts = make_sentences(args.texts)
+    parity_texts = make_sentences(args.parity_texts, seed=1)
+    reference = None
+    if any(backend != "torch" for backend in args.backends):
+        reference = encode(get_embedding_model(args.model, "cpu", "torch"), parity_texts, 32)
+
+    results, failed = {}, []
+    print(f"{'backend':<10} {'min cos':>9} " + " ".join(f"{f'batch {size}/s':>12}" for size in args.batch_sizes))
+    for backend in args.backends:
+        model = get_embedding_model(args.model, "cpu", backend)
+        result = {"encodes_per_second": {}}
+        if backend != "torch":
+            result["parity"] = parity(reference, encode(model, parity_texts, 32))
+            result["parity"]["tolerance"] = TOLERANCE[backend]
+            if result["parity"]["min_cosine"] < TOLERANCE[backend]:
+                failed.append(backend)
+        for size in args.batch_sizes:
+            result["encodes_per_second"][size] = round(throughput(model, texts, size, args.seconds), 1)
+        results[backend] = result
+        min_cosine = f"{result['parity']['min_cosine']:.6f}" if "parity" in result else "-"
+        print(f"{backend:<10} {min_cosine:>9} " + " ".join(
+            f"{result['encodes_per_second'][size]:>12.1f}" for size in args.batch_sizes
+        ))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"model": args.model, "results": results, "models": loaded_models()}, output, indent=2)
+        print(f"Report written to {args.output}")
+    if failed:
+        sys.exit(f"Vectors differ from torch beyond tolerance for: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare HTML extractor backends for output parity and throughput.
+
+Uses the saved pages in benchmarks/html_corpus (or --corpus DIR) plus large
+generated pages. Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_html --repeat 20
+"""
+import argparse
+import os
+import random
+import time
+from typing import Dict
+from app.utils.html_extractor import EXTRACTORS
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "html_corpus")
+
+def generate_page(paragraphs: int, seed: int = 0) -> str:
+    """Build a large article-like page with navigation, scripts and tables."""
+    rng = random.Random(seed)
+    words = "model data latency vector cloud sensor energy market policy robot genome chip".split()
+    body = []
+    for i in range(paragraphs):
+        if i % 25 == 0:
+            body.append(f"<h2>Section {i // 25}</h2>")
+        sentence = " ".join(rng.choices(words, k=40))
+        body.append(f"<p>{sentence} <a href='/x{i}'>link</a> <em>{rng.choice(words)}</em>.</p>")
+        if i % 100 == 0:
+            rows = "".join(f"<tr><td>{rng.random():.3f}</td><td>{rng.choice(words)}</td></tr>" for _ in range(20))
+            body.append(f"<table>{rows}</table>")
+    return (
+        "<html><head><script>var x = 1;</script><style>p{}</style></head><body>"
+        "<header><nav><a href='/'>Home</a></nav></header>"
+        f"<main><article>{''.join(body)}</article></main><footer>footer</footer></body></html>"
+    )
+
+def load_corpus(directory: str) -> Dict[str, str]:
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                pages[name] = f.read()
+    return pages
+
+def word_overlap(a: str, b: str) -> float:
+    """Jaccard overlap of the word sets, 1.0 meaning the same vocabulary."""
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a and not words_b:
+        return 1.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--large-paragraphs", type=int, default=5000)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    pages["generated_large.html"] = generate_page(args.large_paragraphs)
+    backends = {}
+    for name, extractor in EXTRACTORS.items():
+        try:
+            extractor("<html><body><p>probe</p></body></html>")
+            backends[name] = extractor
+        except ImportError as e:
+            print(f"{name}: skipped ({e})")
+
+    print("Output parity against bs4 (exact text / word overlap / tables equal):")
+    reference = backends.get("bs4")
+    for page_name, html in pages.items():
+        expected = reference(html) if reference else None
+        for name, extractor in backends.items():
+            if name == "bs4" or expected is None:
+                continue
+            text, tables = extractor(html)
+            print(
+                f"  {page_name:<24} {name:<7} exact={text == expected[0]!s:<5} "
+                f"overlap={word_overlap(text, expected[0]):.3f} tables={tables == expected[1]}"
+            )
+
+    total_bytes = sum(len(html.encode()) for html in pages.values())
+    print(f"\nThroughput over {len(pages)} pages ({total_bytes / 1024:.0f} KB), {args.repeat} repeats:")
+    for name, extractor in backends.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages.values():
+                extractor(html)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<7} {elapsed:8.2f}s  {total_bytes * args.repeat / 1024 / 1024 / elapsed:8.2f} MB/s")
+
+if __name__ == "__main__":
+    main()
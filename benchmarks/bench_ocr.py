@@ -0,0 +1,79 @@
+"""Compare naive sequential OCR with OcrService on a synthetic image-heavy PDF.
+
+The PDF repeats a logo on every page, scatters small icons, and adds a few
+distinct text images per page. Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_ocr --pages 20
+"""
+import argparse
+import asyncio
+import io
+import random
+import time
+import fitz  # PyMuPDF
+import pytesseract
+from PIL import Image
+from app.benchmarks.fixtures import png, text_image
+from app.services.ocr_service import OcrService
+
+def generate_pdf(pages: int, images_per_page: int, seed: int = 0) -> bytes:
+    """Build a PDF with a shared logo, tiny icons and distinct text images on each page."""
+    rng = random.Random(seed)
+    logo = text_image("ACME Corp", size=(600, 200))
+    icon = png(Image.new("RGB", (24, 24), "red"))
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(20, 20, 220, 80), stream=logo)
+        for i in range(3):
+            page.insert_image(fitz.Rect(20 + 30 * i, 760, 44 + 30 * i, 784), stream=icon)
+        for i in range(images_per_page):
+            text = f"Page {page_number} figure {i} value {rng.randint(0, 10 ** 6)}"
+            top = 100 + i * 150
+            page.insert_image(fitz.Rect(20, top, 580, top + 140), stream=text_image(text))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def naive_ocr(pdf_bytes: bytes) -> int:
+    """The original approach: OCR every image occurrence, one at a time, at full size."""
+    count = 0
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            for img in page.get_images():
+                image = Image.open(io.BytesIO(doc.extract_image(img[0])["image"]))
+                if pytesseract.image_to_string(image).strip():
+                    count += 1
+    return count
+
+async def pooled_ocr(service: OcrService, pdf_bytes: bytes) -> int:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        images = service.collect_images(doc)
+    return len(await service.ocr_images(images))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--images-per-page", type=int, default=3)
+    args = parser.parse_args()
+
+    pdf_bytes = generate_pdf(args.pages, args.images_per_page)
+    print(f"PDF: {args.pages} pages, {len(pdf_bytes) / 1024:.0f} KB")
+
+    start = time.perf_counter()
+    naive_texts = naive_ocr(pdf_bytes)
+    naive_seconds = time.perf_counter() - start
+    print(f"naive sequential: {naive_seconds:8.2f}s  {naive_texts} texts")
+
+    service = OcrService()
+    try:
+        start = time.perf_counter()
+        pooled_texts = asyncio.run(pooled_ocr(service, pdf_bytes))
+        pooled_seconds = time.perf_counter() - start
+    finally:
+        service.shutdown()
+    print(f"OcrService ({service.workers} workers): {pooled_seconds:8.2f}s  {pooled_texts} texts")
+    print(f"speedup: {naive_seconds / pooled_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""End-to-end benchmark of the extraction pipeline that runs fully offline.
+
+The LLM is replaced by FakeOpenAIService, which has a fixed latency and
+returns deterministic topics. Qdrant runs in memory. Embeddings are hash
+vectors unless --embeddings model is given. Each scenario drives the
+TopicService call behind one endpoint:
+- URL pages come from a local HTTP server.
+- PDFs carry text, ruled tables and text images.
+
+For every scenario the report gives throughput, p50/p99 latency, errors
+and RSS, plus p50/p99 for each pipeline stage taken from the request
+timing breakdown. It also records startup cost: a fresh interpreter's
+import of app.main and construction of the real services, plus the
+in-process model warm-up. The report is written as JSON; pass an earlier report
+to --compare to see the change. Run from the directory containing the app
+package:
+
+    CHUNKER_MODE=regex python -m app.benchmarks.bench_pipeline --output bench.json
+    python -m app.benchmarks.bench_pipeline --compare bench.json --output bench-new.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.benchmarks.bench_vector_store import WORDS, make_topics, percentile
+from app.benchmarks.fake_llm import FakeOpenAIService
+from app.benchmarks.fakes import HashEmbeddingService
+from app.benchmarks.fixtures import make_html, make_pdf, make_text
+from app.config import CHUNKER_MODE, EXTRACTION_CONCURRENCY
+from app.models.topic_models import InputType, TextInput
+from app.services.qdrant_service import QdrantService
+from app.services.topic_service import TopicService
+from app.utils.metrics import collect_timings
+from app.utils.resources import current_rss_bytes, peak_rss_bytes
+
+# Run in a fresh interpreter so imports are cold; prints import and service construction seconds
+STARTUP_PROBE = (
+    "import time; started = time.perf_counter(); import app.main; imported = time.perf_counter(); "
+    "from app.services.topic_service import TopicService; TopicService(); "
+    "print(imported - started, time.perf_counter() - imported)"
+)
+
+# A request returns (stage timings in seconds, error message or None)
+Request = Callable[[int], Awaitable[Tuple[Dict[str, float], Optional[str]]]]
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """Serves the same generated page at every path, without validators, so nothing is cached."""
+    page = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_page_server(html: str) -> ThreadingHTTPServer:
+    _PageHandler.page = html.encode("utf-8")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def build_topic_service(args) -> TopicService:
+    if args.embeddings == "hash":
+        embedding_service = HashEmbeddingService()
+    else:
+        from app.services.embedding_service import EmbeddingService
+        embedding_service = EmbeddingService()
+    return TopicService(
+        openai_service=FakeOpenAIService(latency=args.llm_latency, jitter=args.llm_jitter),
+        embedding_service=embedding_service,
+        qdrant_service=QdrantService(embedding_service, backend="memory")
+    )
+
+def extraction_request(service: TopicService, make_input: Callable[[int], TextInput]) -> Request:
+    async def request(i: int):
+        response = await service.process_input(make_input(i), include_timings=True)
+        return response.timings or {}, None if response.status == "success" else response.message
+    return request
+
+def store_request(service: TopicService, batch: int) -> Request:
+    async def request(i: int):
+        with collect_timings() as timings:
+            # Topics rejected as similar are a normal outcome, not an error
+            await service.store_selected_topics(make_topics(batch, seed=i))
+        return timings, None
+    return request
+
+def query_request(service: TopicService) -> Request:
+    async def request(i: int):
+        query = " ".join(random.Random(i).choices(WORDS, k=3))
+        with collect_timings() as timings:
+            await service.qdrant_service.query_topics(query)
+        return timings, None
+    return request
+
+async def run_scenario(request: Request, requests: int, concurrency: int, input_bytes: int, warmup: int = 1) -> Dict:
+    """Issue requests with at most concurrency in flight and summarize latency, stages and memory.
+
+    Warm-up requests run first and are not measured; they absorb one-off costs
+    such as starting the OCR process pool or the tabula JVM.
+    """
+    for i in range(warmup):
+        await request(requests + i)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    errors: List[str] = []
+
+    async def one(i: int):
+        async with semaphore:
+            began = time.perf_counter()
+            try:
+                timings, error = await request(i)
+            except Exception as e:
+                timings, error = {}, f"{type(e).__name__}: {str(e)}"
+            latencies.append(time.perf_counter() - began)
+            for stage, seconds in timings.items():
+                stages.setdefault(stage, []).append(seconds)
+            if error:
+                errors.append(error)
+
+    rss_before = current_rss_bytes()
+    began = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - began
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(requests / wall, 3),
+        "input_mb_per_second": round(input_bytes * requests / wall / 1024 / 1024, 3),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 2),
+        "latency_ms_p99": round(percentile(latencies, 0.99) * 1000, 2),
+        "rss_mb_before": round(rss_before / 1024 / 1024, 1),
+        "rss_mb_after": round(current_rss_bytes() / 1024 / 1024, 1),
+        "peak_rss_mb": round(peak_rss_bytes() / 1024 / 1024, 1),
+        "stages": {
+            stage: {
+                "count": len(values),
+                "ms_p50": round(statistics.median(values) * 1000, 2),
+                "ms_p99": round(percentile(values, 0.99) * 1000, 2),
+            }
+            for stage, values in sorted(stages.items())
+        },
+    }
+
+def measure_cold_start() -> Dict:
+    """Time importing the app and building its services in a new process."""
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True, check=True, timeout=600
+        ).stdout.split()
+        return {"import_app_seconds": round(float(output[-2]), 3), "build_services_seconds": round(float(output[-1]), 3)}
+    except (subprocess.SubprocessError, ValueError, IndexError) as e:
+        return {"error": str(e)}
+
+async def run(args) -> Dict:
+    started_at = datetime.now(timezone.utc).isoformat()
+    startup = measure_cold_start()
+    service = build_topic_service(args)
+    began = time.perf_counter()
+    startup["warm_up_seconds"] = {
+        step: round(seconds, 3) for step, seconds in (await service.warm_up_models()).items()
+    }
+    await service.qdrant_service.warm_up()
+    startup["ready_seconds"] = round(time.perf_counter() - began, 3)
+    print(f"startup: {startup}")
+    text = make_text(args.text_kb * 1024)
+    large_text = make_text(args.large_text_kb * 1024, seed=1)
+    html = make_html(args.html_kb * 1024)
+    pdf = make_pdf(args.pdf_pages, images_per_page=args.pdf_images, tables_per_page=args.pdf_tables)
+    server = start_page_server(html)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    scenarios = {
+        "extract-from-text": (
+            extraction_request(service, lambda i: TextInput(input_type=InputType.TEXT, content=text)),
+            len(text.encode("utf-8"))
+        ),
+        "extract-from-text-large": (
+            extraction_request(service, lambda i: TextInput(input_type=InputType.TEXT, content=large_text)),
+            len(large_text.encode("utf-8"))
+        ),
+        "extract-from-url": (
+            extraction_request(service, lambda i: TextInput(input_type=InputType.URL, content=f"{base_url}/page/{i}")),
+            len(html.encode("utf-8"))
+        ),
+        "extract-from-pdf": (
+            extraction_request(service, lambda i: TextInput(
+                input_type=InputType.PDF, content="bench.pdf", data=pdf, extract_tables=args.pdf_tables > 0
+            )),
+            len(pdf)
+        ),
+        "store-selected-topics": (store_request(service, args.store_batch), 0),
+        # Runs after the stores so there is something to search
+        "ask-question": (query_request(service), 0),
+    }
+    selected = args.scenarios or list(scenarios)
+
+    results = {}
+    try:
+        for name in selected:
+            request, input_bytes = scenarios[name]
+            requests = args.queries if name == "ask-question" else args.requests
+            results[name] = await run_scenario(request, requests, args.concurrency, input_bytes, args.warmup)
+            print(
+                f"{name:<24} {results[name]['requests_per_second']:>8.2f} req/s  "
+                f"p50 {results[name]['latency_ms_p50']:>9.1f} ms  p99 {results[name]['latency_ms_p99']:>9.1f} ms  "
+                f"peak RSS {results[name]['peak_rss_mb']:>7.1f} MB  errors {results[name]['errors']}"
+            )
+    finally:
+        server.shutdown()
+        await service.close()
+
+    return {
+        "meta": {
+            "started_at": started_at,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "chunker_mode": CHUNKER_MODE,
+            "extraction_concurrency": EXTRACTION_CONCURRENCY,
+            "args": vars(args),
+        },
+        "startup": startup,
+        "scenarios": results,
+    }
+
+def compare(baseline: Dict, report: Dict) -> None:
+    """Print throughput and latency changes against an earlier report."""
+    print(f"\n{'scenario':<24} {'req/s':>16} {'p50 ms':>20} {'p99 ms':>20}")
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        cells = []
+        for key in ("requests_per_second", "latency_ms_p50", "latency_ms_p99"):
+            change = (current[key] / before[key] - 1) * 100 if before[key] else 0.0
+            cells.append(f"{before[key]:.1f}->{current[key]:.1f} ({change:+.0f}%)")
+        print(f"{name:<24} {cells[0]:>16} {cells[1]:>20} {cells[2]:>20}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=[
+        "extract-from-text", "extract-from-text-large", "extract-from-url",
+        "extract-from-pdf", "store-selected-topics", "ask-question"
+    ])
+    parser.add_argument("--requests", type=int, default=20, help="Requests per extraction and store scenario")
+    parser.add_argument("--queries", type=int, default=200, help="Requests for ask-question")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured requests before each scenario")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative +/- spread of the fake latency")
+    parser.add_argument("--embeddings", choices=["hash", "model"], default="hash")
+    parser.add_argument("--text-kb", type=int, default=20)
+    parser.add_argument("--large-text-kb", type=int, default=1024)
+    parser.add_argument("--html-kb", type=int, default=50)
+    parser.add_argument("--pdf-pages", type=int, default=10)
+    parser.add_argument("--pdf-images", type=int, default=2, help="Text images per PDF page")
+    parser.add_argument("--pdf-tables", type=int, default=1, help="Ruled tables per PDF page; 0 skips tabula")
+    parser.add_argument("--store-batch", type=int, default=50, help="Topics per store-selected-topics request")
+    parser.add_argument("--output", default="bench_pipeline.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(json.load(baseline), report)
+
+if __name__ == "__main__":
+    main()
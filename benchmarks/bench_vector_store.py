@@ -0,0 +1,98 @@
+"""Compare insert and query latency of the vector store backends.
+
+Uses QdrantService with hash embeddings so only the store is measured.
+--include-remote adds the server configured by QDRANT_URL/QDRANT_API_KEY;
+it writes to that server's 'topics' collection, so only use it against a
+test cluster. Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_vector_store --topics 2000 --queries 200
+"""
+import argparse
+import asyncio
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+from app.benchmarks.fakes import HashEmbeddingService
+from app.models.topic_models import Topic, TopicAttribute
+from app.services import qdrant_service as qdrant_module
+from app.services.qdrant_service import QdrantService
+
+WORDS = "edge ai quantum chip battery genome privacy robot climate sensor market vector search cloud".split()
+
+def make_topics(count: int, seed: int = 0) -> List[Topic]:
+    rng = random.Random(seed)
+    return [
+        Topic(
+            topic=" ".join(rng.choices(WORDS, k=5)) + f" {i}",
+            attributes=TopicAttribute(
+                field=rng.choice(["AI", "Energy", "Health"]),
+                sub_field="",
+                subject_matter="",
+                relevance="",
+                potential_impact="",
+                hotness=rng.choice(["High", "Medium", "Low"])
+            )
+        )
+        for i in range(count)
+    ]
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+async def run_backend(backend: str, topics: List[Topic], queries: int, batch: int) -> Dict[str, float]:
+    service = QdrantService(HashEmbeddingService(), backend=backend)
+    try:
+        insert_times = []
+        for start in range(0, len(topics), batch):
+            began = time.perf_counter()
+            # A threshold above 1 disables dedup so every backend stores the same points
+            await service.store_topics(topics[start:start + batch], similarity_threshold=1.01)
+            insert_times.append((time.perf_counter() - began) * 1000)
+
+        query_times = []
+        rng = random.Random(1)
+        for _ in range(queries):
+            query = " ".join(rng.choices(WORDS, k=3))
+            began = time.perf_counter()
+            await service.query_topics(query)
+            query_times.append((time.perf_counter() - began) * 1000)
+    finally:
+        await service.close()
+
+    return {
+        "insert_batch_ms_p50": statistics.median(insert_times),
+        "insert_batch_ms_p99": percentile(insert_times, 0.99),
+        "query_ms_p50": statistics.median(query_times),
+        "query_ms_p99": percentile(query_times, 0.99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--include-remote", action="store_true")
+    args = parser.parse_args()
+
+    topics = make_topics(args.topics)
+    local_dir = tempfile.mkdtemp(prefix="qdrant_bench_")
+    qdrant_module.QDRANT_LOCAL_PATH = local_dir
+    backends = ["memory", "local"] + (["remote"] if args.include_remote else [])
+
+    print(f"{'backend':<8} {'insert p50':>11} {'insert p99':>11} {'query p50':>10} {'query p99':>10}  (ms, batch={args.batch})")
+    try:
+        for backend in backends:
+            result = asyncio.run(run_backend(backend, topics, args.queries, args.batch))
+            print(
+                f"{backend:<8} {result['insert_batch_ms_p50']:>11.2f} {result['insert_batch_ms_p99']:>11.2f} "
+                f"{result['query_ms_p50']:>10.2f} {result['query_ms_p99']:>10.2f}"
+            )
+    finally:
+        shutil.rmtree(local_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Memory of the production server at different worker counts.
+
+Starts gunicorn with app/gunicorn.conf.py for each worker count, waits until
+every worker answers the health check, then reads the master's and each
+worker's memory from /proc (Linux only):
+- rss_mb: resident pages, counting shared pages in full for every process.
+- pss_mb: proportional share; shared pages are split between the processes
+  using them, so summing PSS gives the real footprint.
+- private_mb: pages only this process has.
+With the models preloaded in the master, the workers' PSS should sit well
+below their RSS. Compare against --no-preload to see what the sharing saves.
+Run from the directory containing the app package:
+
+    python -m app.benchmarks.bench_workers --workers 1 4 8 --output bench_workers.json
+"""
+import argparse
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """RSS, PSS and private memory of a process in MB, from smaps_rollup."""
+    fields = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if name in fields:
+                fields[name] = int(value.split()[0])
+    return {
+        "rss_mb": round(fields["Rss"] / 1024, 1),
+        "pss_mb": round(fields["Pss"] / 1024, 1),
+        "private_mb": round((fields["Private_Clean"] + fields["Private_Dirty"]) / 1024, 1),
+    }
+
+def child_pids(pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The parent pid is the second field after the parenthesized command name
+                if int(stat.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    return sorted(children)
+
+def wait_until_up(url: str, master: subprocess.Popen, workers: int, timeout: float) -> Optional[str]:
+    """Wait for the health check to answer and all workers to be forked; returns an error or None."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if master.poll() is not None:
+            return f"gunicorn exited with code {master.returncode}"
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200 and len(child_pids(master.pid)) >= workers:
+                    return None
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return f"not up after {timeout}s"
+
+def measure(workers: int, port: int, preload: bool, health: str, settle: float, timeout: float) -> Dict:
+    env = dict(
+        os.environ,
+        WEB_WORKERS=str(workers),
+        WEB_BIND=f"127.0.0.1:{port}",
+        PRELOAD_MODELS="true" if preload else "false",
+    )
+    started = time.perf_counter()
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", CONFIG, "app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        error = wait_until_up(f"http://127.0.0.1:{port}/health/{health}", master, workers, timeout)
+        if error:
+            return {"workers": workers, "error": error}
+        up_seconds = time.perf_counter() - started
+        # Let the background warm-up in each worker finish touching its pages
+        time.sleep(settle)
+        master_memory = memory_mb(master.pid)
+        worker_memory = [memory_mb(pid) for pid in child_pids(master.pid)]
+        return {
+            "workers": workers,
+            "up_seconds": round(up_seconds, 2),
+            "master": master_memory,
+            "per_worker": worker_memory,
+            "worker_rss_mb_mean": round(sum(m["rss_mb"] for m in worker_memory) / len(worker_memory), 1),
+            "worker_pss_mb_mean": round(sum(m["pss_mb"] for m in worker_memory) / len(worker_memory), 1),
+            "total_pss_mb": round(master_memory["pss_mb"] + sum(m["pss_mb"] for m in worker_memory), 1),
+        }
+    finally:
+        master.send_signal(signal.SIGTERM)
+        try:
+            _, stderr = master.communicate(timeout=60)
+        except subprocess.TimeoutExpired:
+            master.kill()
+            _, stderr = master.communicate()
+        if master.returncode not in (0, -signal.SIGTERM):
+            print(stderr[-2000:], file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-preload", action="store_true", help="Let each worker load its own models")
+    parser.add_argument("--health", choices=["live", "ready"], default="ready",
+                        help="Endpoint to wait for; ready also waits for the model warm-up and Qdrant")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait after startup before measuring")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for the server to come up")
+    parser.add_argument("--output", default="bench_workers.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    results = []
+    for workers in args.workers:
+        result = measure(workers, args.port, not args.no_preload, args.health, args.settle, args.timeout)
+        results.append(result)
+        if "error" in result:
+            print(f"{workers:>2} workers: {result['error']}")
+        else:
+            print(
+                f"{workers:>2} workers: up in {result['up_seconds']:>6.1f}s  "
+                f"master RSS {result['master']['rss_mb']:>7.1f} MB  "
+                f"worker RSS {result['worker_rss_mb_mean']:>7.1f} MB  PSS {result['worker_pss_mb_mean']:>7.1f} MB  "
+                f"total PSS {result['total_pss_mb']:>8.1f} MB"
+            )
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
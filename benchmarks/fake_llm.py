@@ -0,0 +1,57 @@
+"""Offline stand-in for the LLM topic extraction, used by the pipeline benchmark."""
+import hashlib
+import os
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+# The OpenAI client is created when openai_service is imported and requires a key; the fake never calls it
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from app.models.topic_models import Topic, TopicAttribute, TopicList
+from app.services.openai_service import OpenAIService
+from app.services.topic_cache import TopicCache
+
+class FakeOpenAIService(OpenAIService):
+    """OpenAIService whose extract_topics sleeps for a fixed latency instead of calling the API.
+
+    Topics are derived from a hash of the chunk, so runs are repeatable. The
+    topic cache is disabled by default so every chunk pays the latency.
+    """
+
+    FIELDS = ["AI", "Energy", "Health", "Finance", "Climate"]
+    HOTNESS = ["High", "Medium", "Low"]
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        topics_per_chunk: int = 3,
+        cache: Optional[TopicCache] = None
+    ):
+        super().__init__(cache if cache is not None else TopicCache(max_entries=0, db_path=None))
+        self.latency = latency
+        self.jitter = jitter
+        self.topics_per_chunk = topics_per_chunk
+
+    def extract_topics(self, text: str) -> SimpleNamespace:
+        rng = random.Random(hashlib.sha1(text.encode("utf-8")).digest())
+        time.sleep(max(0.0, self.latency * (1 + rng.uniform(-self.jitter, self.jitter))))
+        words = sorted(set(re.findall(r"[a-z]{4,}", text.lower()))) or ["empty"]
+        topics = []
+        for _ in range(self.topics_per_chunk):
+            topics.append(Topic(
+                topic=" ".join(rng.sample(words, min(3, len(words)))).title(),
+                attributes=TopicAttribute(
+                    field=rng.choice(self.FIELDS),
+                    sub_field="Benchmark",
+                    subject_matter="Generated",
+                    relevance=f"{rng.randint(1, 10)}/10",
+                    potential_impact="Unknown",
+                    hotness=rng.choice(self.HOTNESS)
+                )
+            ))
+        # Same shape as the ell response: the structured output is on .parsed
+        return SimpleNamespace(parsed=TopicList(topics=topics))
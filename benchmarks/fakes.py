@@ -0,0 +1,41 @@
+"""Deterministic offline stand-ins for the model-backed services, used by the benchmarks."""
+import hashlib
+import numpy as np
+from typing import List, Sequence
+from app.utils.lru_cache import LRUCache
+
+class HashEmbeddingService:
+    """Bag-of-words hash embeddings with the EmbeddingService interface.
+
+    Each word maps to a fixed pseudo-random vector, so titles sharing words
+    are similar, but no model is loaded.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.model = None
+        self.dimension = dimension
+        self.cache = LRUCache(max_entries=4096)
+
+    def _word_vector(self, word: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha1(word.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+
+    def encode_many(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split() or [""]:
+                vectors[row] += self._word_vector(word)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+    def encode(self, text: str) -> np.ndarray:
+        return self.encode_many([text])[0]
+
+    async def aencode_many(self, texts: Sequence[str]) -> np.ndarray:
+        return self.encode_many(texts)
+
+    async def aencode(self, text: str) -> np.ndarray:
+        return self.encode(text)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.encode(text).tolist()
@@ -0,0 +1,81 @@
+"""Generated inputs for the benchmarks: plain text, HTML pages and PDFs with images and tables."""
+import io
+import random
+from typing import List
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw
+from app.benchmarks.bench_chunker import WORDS, generate_text
+
+def png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def text_image(text: str, size=(1600, 400)) -> bytes:
+    """A white PNG with a few lines of text, large enough to pass the OCR size filter."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for line, y in enumerate(range(20, size[1] - 40, 60)):
+        draw.text((20, y), f"{text} line {line}", fill="black")
+    return png(image)
+
+def make_text(size_bytes: int, seed: int = 0) -> str:
+    return generate_text(size_bytes, seed)
+
+def _table_rows(rng: random.Random, rows: int, columns: int) -> List[List[str]]:
+    header = [word.capitalize() for word in rng.sample(WORDS, columns)]
+    return [header] + [[str(rng.randint(0, 10 ** 4)) for _ in range(columns)] for _ in range(rows)]
+
+def make_html(size_bytes: int, tables: int = 2, seed: int = 0) -> str:
+    """An article page with boilerplate navigation, headed paragraphs and data tables."""
+    rng = random.Random(seed)
+    paragraphs = generate_text(size_bytes, seed).split("\n\n")
+    body = []
+    for i, paragraph in enumerate(paragraphs):
+        if i % 5 == 0:
+            body.append(f"<h2>{' '.join(rng.sample(WORDS, 4)).title()}</h2>")
+        body.append(f"<p>{paragraph}</p>")
+    for _ in range(tables):
+        rows = "".join(
+            "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>"
+            for row in _table_rows(rng, 6, 4)
+        )
+        body.insert(rng.randint(0, len(body)), f"<table>{rows}</table>")
+    return (
+        "<!DOCTYPE html><html><head><title>Benchmark article</title>"
+        "<style>p { margin: 0 }</style><script>var tracking = true;</script></head><body>"
+        "<header><nav><a href='/'>Home</a> <a href='/news'>News</a></nav></header>"
+        f"<main><article><h1>Benchmark article</h1>{''.join(body)}</article></main>"
+        "<footer>Copyright Benchmark Inc</footer></body></html>"
+    )
+
+def _draw_table(page, top: float, rows: List[List[str]]) -> float:
+    """Draw a ruled table so tabula can detect it; returns the bottom edge."""
+    cell_width, cell_height = 120, 18
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            rect = fitz.Rect(40 + c * cell_width, top + r * cell_height, 40 + (c + 1) * cell_width, top + (r + 1) * cell_height)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+            page.insert_text((rect.x0 + 4, rect.y1 - 5), cell, fontsize=9)
+    return top + len(rows) * cell_height
+
+def make_pdf(pages: int, images_per_page: int = 1, tables_per_page: int = 1, seed: int = 0) -> bytes:
+    """A PDF whose pages each hold a paragraph of text, ruled tables and distinct text images."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        text = generate_text(1500, seed * 10007 + page_number)
+        page.insert_textbox(fitz.Rect(40, 40, 560, 300), text, fontsize=9)
+        top = 310
+        for _ in range(tables_per_page):
+            top = _draw_table(page, top, _table_rows(rng, 5, 4)) + 15
+        for i in range(images_per_page):
+            if top + 110 > 800:
+                break
+            caption = f"Page {page_number} figure {i} {' '.join(rng.sample(WORDS, 3))}"
+            page.insert_image(fitz.Rect(40, top, 560, top + 100), stream=text_image(caption))
+            top += 110
+    data = doc.tobytes()
+    doc.close()
+    return data
@@ -0,0 +1,74 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# LLM topic extraction
+EXTRACTION_CONCURRENCY = int(os.getenv("EXTRACTION_CONCURRENCY", "8"))  # Max in-flight LLM calls per process
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "120"))  # Seconds allowed per LLM call
+EXTRACTION_MAX_RETRIES = int(os.getenv("EXTRACTION_MAX_RETRIES", "4"))  # Retries on rate-limit errors and timeouts
+EXTRACTION_BACKOFF_BASE = float(os.getenv("EXTRACTION_BACKOFF_BASE", "1.0"))  # First backoff delay in seconds
+EXTRACTION_BACKOFF_MAX = float(os.getenv("EXTRACTION_BACKOFF_MAX", "30.0"))  # Backoff delay cap in seconds
+
+# Topic extraction cache
+TOPIC_CACHE_MAX_ENTRIES = int(os.getenv("TOPIC_CACHE_MAX_ENTRIES", "2048"))  # In-process LRU size
+TOPIC_CACHE_TTL = float(os.getenv("TOPIC_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds before an entry expires
+TOPIC_CACHE_DB_PATH = os.getenv("TOPIC_CACHE_DB_PATH") or None  # SQLite file for the on-disk tier; unset disables it
+TOPIC_CACHE_DISK_MAX_ENTRIES = int(os.getenv("TOPIC_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+# Text chunking
+CHUNKER_MODE = os.getenv("CHUNKER_MODE", "transformer")  # transformer, sentencizer or regex
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_trf")
+STREAM_BLOCK_CHARS = int(os.getenv("STREAM_BLOCK_CHARS", "20000"))  # Text parsed per step when streaming chunks
+
+# Embeddings
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "auto")  # auto, cpu, cuda, cuda:1, ...
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))  # Cached text -> vector entries
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "2"))  # Threads running model encodes
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # torch, onnx or onnx-int8 (quantized, CPU)
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "")  # ONNX file in the model repo; empty picks one for the backend and CPU
+EMBEDDING_ONNX_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))  # Threads per ONNX encode; 0 splits OMP_NUM_THREADS or the cores between EMBEDDING_WORKERS
+
+# Vector store
+VECTOR_STORE = os.getenv("VECTOR_STORE", "remote")  # remote (Qdrant server), local (embedded, on disk) or memory
+QDRANT_URL = os.getenv("QDRANT_URL", "https://d3015961-e04b-4057-8be9-21b2f28c9894.europe-west3-0.gcp.cloud.qdrant.io")
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "tfyVEahRthudwnXUysoDmdGPh-2u-LLmTsdWzdiTsWRBJqyr7nqupA")
+QDRANT_LOCAL_PATH = os.getenv("QDRANT_LOCAL_PATH", "qdrant_data")  # Storage directory for the local backend
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "256"))  # Points per upsert request
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "30"))
+QDRANT_MAX_CONNECTIONS = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))  # Pooled HTTP connections to Qdrant
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))  # Question -> vector entries kept for ask-question
+QUERY_RESULT_CACHE_SIZE = int(os.getenv("QUERY_RESULT_CACHE_SIZE", "512"))  # Cached ask-question result lists
+QUERY_RESULT_CACHE_TTL = float(os.getenv("QUERY_RESULT_CACHE_TTL", "30"))  # Seconds a cached result list is served, and so how stale it can be after another worker writes; 0 disables
+
+# Content ingestion
+PDF_EXTRACT_TABLES = os.getenv("PDF_EXTRACT_TABLES", "true").lower() == "true"  # Default for tabula table extraction
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))  # OCR processes, capped at the core count
+OCR_MIN_PIXELS = int(os.getenv("OCR_MIN_PIXELS", "10000"))  # Skip images smaller than this area (icons, bullets)
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "2000"))  # Downscale larger images before OCR
+OCR_TIME_BUDGET = float(os.getenv("OCR_TIME_BUDGET", "120"))  # Seconds of OCR allowed per document
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "30"))  # Seconds per URL fetch
+FETCH_MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", "100"))  # Pooled connections across all hosts
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "4"))  # Concurrent requests to one host
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(10 * 1024 * 1024)))  # Largest page body accepted
+FETCH_CACHE_ENTRIES = int(os.getenv("FETCH_CACHE_ENTRIES", "256"))  # Pages kept for ETag/Last-Modified revalidation
+FETCH_CACHE_BYTES = int(os.getenv("FETCH_CACHE_BYTES", str(64 * 1024 * 1024)))  # Total page bytes kept for revalidation
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto")  # auto (lxml if installed, else bs4), bs4, lxml or stream
+URL_BATCH_MAX_URLS = int(os.getenv("URL_BATCH_MAX_URLS", "500"))  # URLs accepted per batch request
+URL_BATCH_CONCURRENCY = int(os.getenv("URL_BATCH_CONCURRENCY", "16"))  # URLs fetched and processed at once per batch
+
+# Background extraction jobs
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.sqlite3")  # SQLite file holding job inputs and results
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # Jobs processed at once per process
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "1.0"))  # Seconds between progress writes for a running job
+JOB_LEASE_TIMEOUT = float(os.getenv("JOB_LEASE_TIMEOUT", "30"))  # Seconds without a heartbeat before a running job is requeued
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # Seconds an idle worker waits before checking the database for queued jobs
+
+# Topic deduplication
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.85"))  # Title cosine similarity treated as a duplicate; above 1 disables
+
+# Metrics
+METRICS_DIR = os.getenv("METRICS_DIR", "")  # Directory where each server worker saves its metrics for /metrics to merge; empty reports only the answering process
+METRICS_WRITE_INTERVAL = float(os.getenv("METRICS_WRITE_INTERVAL", "5"))  # Seconds between a worker's saves to METRICS_DIR
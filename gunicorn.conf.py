@@ -0,0 +1,71 @@
+"""Production server: uvicorn workers forked from a gunicorn master that has already loaded the models.
+
+Run from the directory containing the app package:
+
+    gunicorn -c app/gunicorn.conf.py app.main:app
+"""
+import glob
+import os
+import sys
+import tempfile
+
+cpu_count = os.cpu_count() or 1
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_WORKERS", "2"))  # Server processes; each shares the preloaded model weights
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WEB_TIMEOUT", "300"))  # Seconds before a silent worker is restarted; large PDFs take a while
+graceful_timeout = 30
+keepalive = 5
+# Import the app, and with it the models (see on_starting), once in the master before forking
+preload_app = True
+preload_models = os.getenv("PRELOAD_MODELS", "true").lower() == "true"
+
+# Split the cores between workers so N workers x torch threads doesn't oversubscribe the CPU.
+# These must be set before torch is imported, which happens when the master preloads the models.
+threads_per_worker = int(os.getenv("WORKER_THREADS", "0")) or max(1, cpu_count // workers)
+for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(variable, str(threads_per_worker))
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+# Each worker has its own OCR process pool, so size it to the worker's share of the cores
+os.environ.setdefault("OCR_WORKERS", str(threads_per_worker))
+# Each worker saves its metrics here so /metrics, whichever worker answers, reports all of them
+metrics_dir = os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"topic-engine-metrics-{os.getpid()}"))
+
+def clear_metrics():
+    # Only the workers' files: METRICS_DIR may be a directory that holds other things
+    for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+        os.remove(path)
+
+def on_starting(server):
+    os.makedirs(metrics_dir, exist_ok=True)
+    # Files left by the workers of an earlier server with the same directory
+    clear_metrics()
+    from app.config import VECTOR_STORE
+    if VECTOR_STORE == "local" and server.cfg.workers > 1:
+        # Embedded Qdrant locks its storage directory, so only one process can open it
+        raise RuntimeError(
+            f"VECTOR_STORE=local can't be shared by {server.cfg.workers} workers; "
+            "set WEB_WORKERS=1 or use the remote backend"
+        )
+    if not preload_models:
+        return
+    from app.services.model_preload import preload_models as load
+    loaded = load()
+    server.log.info(f"Preloaded models before forking {workers} workers: {loaded}")
+
+def post_fork(server, worker):
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads_per_worker)
+    server.log.info(f"Worker {worker.pid} using {threads_per_worker} compute threads")
+
+def child_exit(server, worker):
+    # A replacement worker starts new series under its own pid
+    try:
+        os.remove(os.path.join(metrics_dir, f"{worker.pid}.json"))
+    except FileNotFoundError:
+        pass
+
+def on_exit(server):
+    clear_metrics()
@@ -1,14 +1,78 @@
-from fastapi import FastAPI
+import time
+BOOT_STARTED = time.perf_counter()  # Taken before the app imports so they count towards boot time
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api import topic_api
+from app.services.embedding_provider import loaded_models
+from app.services.job_service import JobService
+from app.services.topic_service import TopicService
+from app.utils.metrics import REGISTRY
+from app.config import METRICS_DIR, METRICS_WRITE_INTERVAL
+import asyncio
 import logging
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(level levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+async def warm_up(app: FastAPI):
+    """Load models, then connect to Qdrant, retrying until it is reachable."""
+    state = app.state
+    try:
+        state.warmup_seconds = await state.topic_service.warm_up_models()
+        state.models_warm = True
+        logging.info(f"Models warm after {sum(state.warmup_seconds.values()):.2f}s")
+    except Exception as e:
+        logging.error(f"Model warm-up failed: {str(e)}", exc_info=True)
+        state.warmup_error = str(e)
+
+    delay = 1.0
+    while not state.topic_service.qdrant_service.collection_ready:
+        try:
+            await state.topic_service.qdrant_service.warm_up()
+        except Exception as e:
+            logging.warning(f"Vector store not reachable yet, retrying in {delay:.0f}s: {str(e)}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+async def write_metrics():
+    """Save this worker's metrics to METRICS_DIR, where the other workers' /metrics read them."""
+    while True:
+        try:
+            await asyncio.to_thread(REGISTRY.write)
+        except OSError as e:
+            logging.warning(f"Failed to write metrics to {METRICS_DIR}: {str(e)}")
+        await asyncio.sleep(METRICS_WRITE_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Construction is cheap: models, OCR workers and Qdrant connections are created on first use,
+    # so the worker boots (and answers liveness probes) even while Qdrant is unreachable
+    topic_service = TopicService()
+    app.state.topic_service = topic_service
+    app.state.job_service = JobService(topic_service)
+    app.state.models_warm = False
+    app.state.warmup_seconds = {}
+    app.state.warmup_error = None
+    # Resume extraction jobs left unfinished by the previous run
+    await app.state.job_service.start()
+    app.state.boot_seconds = time.perf_counter() - BOOT_STARTED
+    logging.info(f"Booted in {app.state.boot_seconds:.2f}s, warming up models in the background")
+
+    warmup_task = asyncio.create_task(warm_up(app))
+    metrics_task = asyncio.create_task(write_metrics()) if METRICS_DIR else None
+    yield
+    warmup_task.cancel()
+    if metrics_task is not None:
+        metrics_task.cancel()
+    await app.state.job_service.stop()
+    await topic_service.close()
+
 app = FastAPI(
     title="Topic Engine for Hue Ai",
     description="""Enhanced API for extracting and analyzing topics from various sources:
@@ -17,7 +81,8 @@ app = FastAPI(
     - User interest specification
     - Topic uniqueness analysis
     - Individual topic storage control""",
-    version="1.2.0"
+    version="1.2.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -28,4 +93,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(topic_api.router)
\ No newline at end of file
+app.include_router(topic_api.router)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: stage latency histograms and segment and cache counters, by worker pid."""
+    return PlainTextResponse(await asyncio.to_thread(REGISTRY.render), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/live", include_in_schema=False)
+async def live():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/health/ready", include_in_schema=False)
+async def ready(request: Request):
+    """Readiness: 200 once models are warm and Qdrant is reachable, 503 while still warming up."""
+    state = request.app.state
+    vector_store_ready = state.topic_service.qdrant_service.collection_ready
+    is_ready = state.models_warm and vector_store_ready
+    return JSONResponse(
+        {
+            "status": "ready" if is_ready else "warming",
+            "booted": True,
+            "models_warm": state.models_warm,
+            "vector_store_ready": vector_store_ready,
+            "boot_seconds": round(state.boot_seconds, 3),
+            "warmup_seconds": {step: round(seconds, 3) for step, seconds in state.warmup_seconds.items()},
+            "warmup_error": state.warmup_error,
+            "models": loaded_models()
+        },
+        status_code=200 if is_ready else 503
+    )
\ No newline at end of file
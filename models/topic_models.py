@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List, Optional
+from datetime import datetime
 from enum import Enum
+from ..config import PDF_EXTRACT_TABLES, URL_BATCH_MAX_URLS
 
 class InputType(str, Enum):
     TEXT = "text"
@@ -24,15 +26,52 @@ class TopicList(BaseModel):
 
 class TextInput(BaseModel):
     input_type: InputType
-    content: str = Field(..., description="Text content, URL, or base64 encoded PDF")
+    content: str = Field(..., description="Text content, URL, or base64 encoded PDF (or the file name when data is set)")
+    data: Optional[bytes] = Field(None, exclude=True, description="Raw PDF bytes; skips the base64 round trip")
+    extract_tables: bool = Field(PDF_EXTRACT_TABLES, description="Run tabula table extraction on PDFs")
 
 class TopicResponse(BaseModel):
     topics: List[Topic]
     message: str
     status: str
+    next_offset: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
+    timings: Optional[Dict[str, float]] = Field(None, description="Seconds spent per pipeline stage, when requested")
 
-class QueryRequest(BaseModel):
+class TopicFilter(BaseModel):
+    field: Optional[str] = None
+    hotness: Optional[str] = None
+    stored_after: Optional[datetime] = None
+    stored_before: Optional[datetime] = None
+
+class UrlTopicResponse(TopicResponse):
+    url: str
+
+class BatchUrlRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=URL_BATCH_MAX_URLS)
+
+class BatchTopicResponse(BaseModel):
+    results: List[UrlTopicResponse]
+    message: str
+    status: str
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: JobState
+    chunks_done: int = 0
+    chunks_total: int = 0
+    result: Optional[TopicResponse] = None
+    error: Optional[str] = None
+
+class QueryRequest(TopicFilter):
     query: str
+    limit: int = Field(5, ge=1, le=100)
+    score_threshold: Optional[float] = Field(None, ge=-1.0, le=1.0, description="Minimum cosine similarity")
 
 
 
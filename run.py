@@ -2,4 +2,5 @@ import uvicorn
 from app.main import app
 
 if __name__ == "__main__":
+    # Development server with reload; production runs under gunicorn (see gunicorn.conf.py)
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
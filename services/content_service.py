@@ -1,25 +1,36 @@
-import re
-from PyPDF2 import PdfReader
-import pytesseract
-from PIL import Image
-import fitz  # PyMuPDF
 import io
 import base64
-from bs4 import BeautifulSoup
-import requests
+import httpx
 import logging
-from typing import Tuple, List
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
-import tabula
 import asyncio
+from .ocr_service import OcrService
+from .http_fetcher import HttpFetcher, ResponseTooLarge
+from ..utils.html_extractor import extract_html
+from ..utils.metrics import timed
+from ..config import PDF_EXTRACT_TABLES
 
 class ContentService:
+    def __init__(self, ocr_service: Optional[OcrService] = None, http_fetcher: Optional[HttpFetcher] = None):
+        # Owned by this instance and released by close(); both start their pools lazily
+        self.ocr_service = ocr_service or OcrService()
+        self.http_fetcher = http_fetcher or HttpFetcher()
+
+    async def close(self):
+        """Close the HTTP connection pool and stop the OCR workers."""
+        await self.http_fetcher.close()
+        self.ocr_service.shutdown()
+
     @staticmethod
     def extract_tables_from_pdf(pdf_bytes: bytes) -> List[str]:
         """Extract tables from PDF using tabula-py"""
         try:
+            # tabula starts a JVM through JPype, so only import it when tables are requested
+            import tabula
             tables = []
-            dfs = tabula.read_pdf(io.BytesIO(pdf_bytes), pages='all')
+            with timed("pdf_tables"):
+                dfs = tabula.read_pdf(io.BytesIO(pdf_bytes), pages='all')
             for df in dfs:
                 tables.append(df.to_string())
             return tables
@@ -27,108 +38,79 @@ class ContentService:
             logging.warning(f"Failed to extract tables: {str(e)}")
             return []
 
-    @staticmethod
-    async def extract_images_from_pdf(pdf_bytes: bytes) -> List[str]:
+    def _read_pdf(self, pdf_bytes: bytes) -> Tuple[List[str], List[bytes]]:
+        """Open the PDF once with PyMuPDF and return its page texts and distinct embedded images."""
+        import fitz  # PyMuPDF
+        with timed("pdf_parse"), fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            pages = [page.get_text() for page in doc]
+            images = self.ocr_service.collect_images(doc)
+        return pages, images
+
+    async def extract_images_from_pdf(self, pdf_bytes: bytes) -> List[str]:
         """Extract and process images from PDF using PyMuPDF"""
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            texts = []
-
-            for page in doc:
-                images = page.get_images()
-                for img in images:
-                    xref = img[0]
-                    base_image = doc.extract_image(xref)
-                    image_bytes = base_image["image"]
-
-                    # Convert to PIL Image
-                    image = Image.open(io.BytesIO(image_bytes))
-
-                    # Extract text from image using OCR
-                    text = await asyncio.to_thread(pytesseract.image_to_string, image)
-                    if text.strip():
-                        texts.append(text)
-
-            return texts
+            _, images = await asyncio.to_thread(self._read_pdf, pdf_bytes)
+            return await self.ocr_service.ocr_images(images)
         except Exception as e:
             logging.warning(f"Failed to extract images: {str(e)}")
             return []
 
-    @staticmethod
-    async def extract_text_from_pdf(pdf_base64: str) -> Tuple[str, List[str], List[str]]:
+    async def extract_pdf_content(
+        self,
+        pdf_bytes: bytes,
+        extract_tables: bool = PDF_EXTRACT_TABLES
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Extract page texts, tables and image text from raw PDF bytes.
+
+        The document is parsed once; table extraction (which starts a JVM) then
+        runs in a worker thread while images are OCRed in the process pool.
+        Tables are only extracted when requested.
+        """
         try:
-            pdf_bytes = base64.b64decode(pdf_base64)
-
-            # Extract text
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PdfReader(pdf_file)
-            text = []
-
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
+            pages, images = await asyncio.to_thread(self._read_pdf, pdf_bytes)
+        except Exception as e:
+            logging.error(f"Failed to process PDF: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Failed to process PDF: {str(e)}")
 
-            # Extract tables
-            tables = ContentService.extract_tables_from_pdf(pdf_bytes)
+        if extract_tables:
+            tables_task = asyncio.to_thread(ContentService.extract_tables_from_pdf, pdf_bytes)
+        else:
+            tables_task = asyncio.sleep(0, result=[])
+        tables, image_texts = await asyncio.gather(tables_task, self._ocr_images(images))
 
-            # Extract images
-            image_texts = await ContentService.extract_images_from_pdf(pdf_bytes)
+        return [page for page in pages if page.strip()], tables, image_texts
 
-            # Combine all text
-            all_text = " ".join(text)
+    async def _ocr_images(self, images: List[bytes]) -> List[str]:
+        with timed("ocr"):
+            return await self.ocr_service.ocr_images(images)
 
-            return all_text, tables, image_texts
-        except Exception as e:
-            logging.error(f"Failed to process PDF: {str(e)}")
+    async def extract_text_from_pdf(self, pdf_base64: str) -> Tuple[str, List[str], List[str]]:
+        """Extract text, tables and image text from a base64 encoded PDF."""
+        try:
+            pdf_bytes = base64.b64decode(pdf_base64)
+        except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Failed to process PDF: {str(e)}")
+        pages, tables, image_texts = await self.extract_pdf_content(pdf_bytes, extract_tables=True)
+        return " ".join(pages), tables, image_texts
 
-    @staticmethod
-    async def extract_text_from_url(url: str) -> Tuple[str, List[str]]:
+    async def extract_text_from_url(self, url: str) -> Tuple[str, List[str]]:
         """Extract text and tables from a webpage URL."""
         try:
-            # Add headers to mimic a browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'header', 'footer', 'nav']):
-                element.decompose()
-
-            # Extract main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('body')
-            if main_content:
-                # Extract paragraphs and headings
-                content_elements = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                text = ' '.join([elem.get_text(strip=True) for elem in content_elements])
-            else:
-                # Fallback if no main content area found
-                text = soup.get_text(strip=True)
-
-            # Remove excessive whitespace and unwanted special characters
-            text = re.sub(r'\s+', ' ', text)
-            text = re.sub(r'[^\w\s.,!?-]', '', text)
-
-            # Extract tables if any
-            tables = []
-            for table in soup.find_all('table'):
-                tables.append(table.get_text(separator=" ", strip=True))
+            with timed("url_fetch"):
+                html = await self.http_fetcher.fetch_text(url)
+
+            # Parsing is CPU bound, so keep it off the event loop
+            with timed("html_parse"):
+                text, tables = await asyncio.to_thread(extract_html, html)
 
-            if not text.strip():
+            if not text:
                 raise ValueError("No readable content found on the page")
 
-            return text.strip(), tables
+            return text, tables
 
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ResponseTooLarge) as e:
             logging.error(f"Failed to fetch URL: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {str(e)}")
         except Exception as e:
             logging.error(f"Error processing URL content: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error processing URL content: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=400, detail=f"Error processing URL content: {str(e)}")
@@ -0,0 +1,123 @@
+import logging
+import os
+import platform
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from ..config import (
+    EMBEDDING_MODEL, EMBEDDING_DEVICE, EMBEDDING_BACKEND, EMBEDDING_ONNX_FILE, EMBEDDING_ONNX_THREADS,
+    EMBEDDING_WORKERS
+)
+from ..utils.resources import current_rss_bytes
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# One SentenceTransformer per (model, device, backend) for the whole process
+_models: Dict[Tuple[str, str, str], object] = {}
+_load_stats: Dict[Tuple[str, str, str], Dict] = {}
+_models_lock = threading.Lock()
+
+def resolve_device(device: Optional[str] = None, backend: Optional[str] = None) -> str:
+    """Map 'auto' (the default) to cuda when available, otherwise cpu; the ONNX backends default to cpu."""
+    device = device or EMBEDDING_DEVICE
+    if device != "auto":
+        return device
+    if (backend or EMBEDDING_BACKEND) != "torch":
+        return "cpu"
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def _cpu_flags() -> set:
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+def onnx_file(backend: str) -> str:
+    """The ONNX export to load from the model repo: fp32, or the int8 build for this CPU's instruction set."""
+    if EMBEDDING_ONNX_FILE:
+        return EMBEDDING_ONNX_FILE
+    if backend == "onnx":
+        return "onnx/model.onnx"
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+def onnx_threads() -> int:
+    """Intra-op threads per ONNX session.
+
+    The embedding pool runs EMBEDDING_WORKERS encodes at once, so each gets
+    its share of OMP_NUM_THREADS (set per worker by gunicorn.conf.py) or of
+    the cores.
+    """
+    if EMBEDDING_ONNX_THREADS:
+        return EMBEDDING_ONNX_THREADS
+    available = int(os.getenv("OMP_NUM_THREADS", "0")) or os.cpu_count() or 1
+    return max(1, available // max(1, EMBEDDING_WORKERS))
+
+def _model_kwargs(backend: str) -> Dict:
+    if backend == "torch":
+        return {}
+    import onnxruntime
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = onnx_threads()
+    # Concurrency comes from the embedding pool; one encode never runs graph branches in parallel
+    options.inter_op_num_threads = 1
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return {"file_name": onnx_file(backend), "session_options": options}
+
+def _model_bytes(model, backend: str) -> Optional[int]:
+    if backend == "torch":
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    # ONNX weights live in the runtime session, not in torch parameters
+    path = getattr(model[0].auto_model, "model_path", None)
+    return os.path.getsize(path) if path and os.path.exists(path) else None
+
+def get_embedding_model(model_name: Optional[str] = None, device: Optional[str] = None, backend: Optional[str] = None):
+    """Return the shared SentenceTransformer for a model and backend, loading it on first use."""
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    key = (model_name or EMBEDDING_MODEL, resolve_device(device, backend), backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        if key not in _models:
+            from sentence_transformers import SentenceTransformer
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            model = SentenceTransformer(
+                key[0], device=key[1], backend="torch" if backend == "torch" else "onnx",
+                model_kwargs=_model_kwargs(backend)
+            )
+            load_seconds = time.perf_counter() - start
+            _load_stats[key] = {
+                "model": key[0],
+                "device": key[1],
+                "backend": backend,
+                "load_seconds": round(load_seconds, 3),
+                "rss_delta_bytes": current_rss_bytes() - rss_before,
+                "parameter_bytes": _model_bytes(model, backend),
+            }
+            if backend != "torch":
+                _load_stats[key]["onnx_file"] = onnx_file(backend)
+                _load_stats[key]["onnx_threads"] = onnx_threads()
+            _models[key] = model
+            logging.info(f"Loaded embedding model {key[0]} ({backend}) on {key[1]} in {load_seconds:.2f}s")
+        return _models[key]
+
+def loaded_models() -> List[Dict]:
+    """Report load time and memory for every embedding model loaded so far."""
+    return list(_load_stats.values())
@@ -1,14 +1,83 @@
-from sentence_transformers import SentenceTransformer 
+import asyncio
 import numpy as np
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+from .embedding_provider import get_embedding_model
+from ..utils.lru_cache import LRUCache
+from ..utils.metrics import CACHE_REQUESTS, timed
+from ..config import EMBEDDING_CACHE_SIZE, EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS
 
 class EmbeddingService:
-    def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, model_name: Optional[str] = None, device: Optional[str] = None, backend: Optional[str] = None):
+        self.model_name = model_name
+        self.device = device
+        self.backend = backend
+        self._model = None
+        self.cache = LRUCache(max_entries=EMBEDDING_CACHE_SIZE)
+        # Dedicated pool so model encodes never run on the event loop or starve asyncio.to_thread
+        self._executor = ThreadPoolExecutor(max_workers=EMBEDDING_WORKERS, thread_name_prefix="embedding")
+
+    @property
+    def model(self):
+        """The shared sentence transformer, loaded on first use so construction stays cheap."""
+        if self._model is None:
+            self._model = get_embedding_model(self.model_name, self.device, self.backend)
+        return self._model
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def dimension(self) -> int:
+        """Size of the vectors produced by the model."""
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed many texts in one batched call, returning unit-normalized float32 rows.
+
+        Vectors are cached per text, so only texts not seen recently reach the
+        model, and each distinct text in the batch is encoded once.
+        """
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        CACHE_REQUESTS.inc(len(texts) - len(missing), cache="embeddings", result="hit")
+        CACHE_REQUESTS.inc(len(missing), cache="embeddings", result="miss")
+        if missing:
+            encoded = self.model.encode(
+                missing,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float32, copy=False)
+            fresh = {}
+            for text, vector in zip(missing, encoded):
+                vector.setflags(write=False)  # Cached rows are shared between callers
+                fresh[text] = vector
+                self.cache.set(text, vector)
+            vectors = [vector if vector is not None else fresh[text] for text, vector in zip(texts, vectors)]
+        if not vectors:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def encode(self, text: str) -> np.ndarray:
+        """Embed a single text, using the cache when possible."""
+        return self.encode_many([text])[0]
+        
+    async def aencode_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Async encode_many that runs the model in the embedding worker pool."""
+        loop = asyncio.get_running_loop()
+        # Timed here rather than in encode_many: executor threads don't inherit the request context
+        with timed("embedding"):
+            return await loop.run_in_executor(self._executor, self.encode_many, list(texts))
+
+    async def aencode(self, text: str) -> np.ndarray:
+        """Async encode that runs the model in the embedding worker pool."""
+        return (await self.aencode_many([text]))[0]
         
     def get_embedding(self, text: str) -> List[float]:
         """Generate an embedding for the given text."""
-        return self.model.encode(text).tolist()
+        return self.encode(text).tolist()
         
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between two embeddings."""
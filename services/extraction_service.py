@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+import openai
+from .openai_service import OpenAIService
+from ..models.topic_models import Topic
+from ..config import (
+    EXTRACTION_CONCURRENCY,
+    EXTRACTION_TIMEOUT,
+    EXTRACTION_MAX_RETRIES,
+    EXTRACTION_BACKOFF_BASE,
+    EXTRACTION_BACKOFF_MAX,
+)
+
+class ExtractionProgress:
+    """Counts the segments scheduled and finished for one piece of work."""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+
+class ExtractionService:
+    """Run LLM topic extraction over many text segments with bounded parallelism."""
+
+    def __init__(
+        self,
+        openai_service: Optional[OpenAIService] = None,
+        concurrency: int = EXTRACTION_CONCURRENCY,
+        timeout: float = EXTRACTION_TIMEOUT,
+        max_retries: int = EXTRACTION_MAX_RETRIES,
+        backoff_base: float = EXTRACTION_BACKOFF_BASE,
+        backoff_max: float = EXTRACTION_BACKOFF_MAX,
+    ):
+        self.openai_service = openai_service or OpenAIService()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Shared by every request on this instance so the limit is per process, not per request
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Calls still running in a thread, including ones whose caller timed out
+        self._calls = set()
+        # The ell client is synchronous. Its calls get their own threads, one per slot, so
+        # blocked LLM calls can't take the default pool that chunking and parsing run in.
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm")
+        # How far a lazy producer may run ahead of extraction before it is paused
+        self.max_pending = concurrency * 2
+
+    async def extract(self, text: str) -> List[Topic]:
+        """Extract topics from a single text segment, retrying with backoff on rate limits and timeouts."""
+        attempt = 0
+        while True:
+            call = await self._start_call(text)
+            try:
+                # Shielded so a timeout stops the wait but not the call, which keeps its slot until it returns
+                result = await asyncio.wait_for(asyncio.shield(call), timeout=self.timeout)
+                return result.topics
+            except openai.RateLimitError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                reason = "Rate limited by LLM API"
+            except asyncio.TimeoutError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, None)
+                reason = f"LLM call timed out after {self.timeout:.0f}s"
+            # Sleep without holding a slot so waiting calls don't block others
+            attempt += 1
+            logging.warning(f"{reason}, retrying in {delay:.1f}s (attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def _start_call(self, text: str) -> asyncio.Future:
+        """Take a concurrency slot and start one LLM call; the slot is freed when the call's thread returns."""
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the caller's context, as asyncio.to_thread does, so the call's timings reach the request
+        context = contextvars.copy_context()
+        try:
+            call = asyncio.ensure_future(loop.run_in_executor(
+                self._executor, functools.partial(context.run, self.openai_service.get_topics, text)
+            ))
+        except BaseException:
+            # e.g. the executor was shut down; the slot was never handed to a call
+            self._semaphore.release()
+            raise
+        self._calls.add(call)
+        call.add_done_callback(self._finish_call)
+        return call
+
+    def close(self):
+        """Stop the LLM threads, without waiting for calls still in flight."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish_call(self, call: asyncio.Future):
+        self._calls.discard(call)
+        self._semaphore.release()
+        if not call.cancelled():
+            # Mark the error as retrieved; a caller that timed out has already moved on
+            call.exception()
+
+    async def _extract_tracked(self, text: str, progress: Optional[ExtractionProgress]) -> List[Topic]:
+        topics = await self.extract(text)
+        if progress is not None:
+            progress.done += 1
+        return topics
+
+    async def extract_many(
+        self,
+        texts: Sequence[str],
+        progress: Optional[ExtractionProgress] = None
+    ) -> List[List[Topic]]:
+        """Extract topics from many segments concurrently; results keep the input order."""
+        if progress is not None:
+            progress.total += len(texts)
+        return await asyncio.gather(*(self._extract_tracked(text, progress) for text in texts))
+
+    async def extract_iter(
+        self,
+        texts: Iterable[str],
+        progress: Optional[ExtractionProgress] = None
+    ) -> List[List[Topic]]:
+        """Extract topics from a lazily produced sequence of segments, in input order."""
+        results = {}
+        async for index, topics in self.extract_as_completed(texts, progress):
+            results[index] = topics
+        return [results[index] for index in range(len(results))]
+
+    async def extract_as_completed(
+        self,
+        texts: Iterable[str],
+        progress: Optional[ExtractionProgress] = None
+    ) -> AsyncIterator[Tuple[int, List[Topic]]]:
+        """Yield (index, topics) for each segment as soon as its extraction finishes.
+
+        Segments are pulled from the iterator in a worker thread, so CPU-bound
+        producers such as the streaming chunker overlap with the LLM calls.
+        """
+        iterator = iter(texts)
+        index = 0
+        pending = set()
+        producer = asyncio.create_task(asyncio.to_thread(next, iterator, None))
+
+        async def indexed(i: int, text: str) -> Tuple[int, List[Topic]]:
+            return i, await self._extract_tracked(text, progress)
+
+        try:
+            while producer is not None or pending:
+                waiting = set(pending)
+                # Backpressure: stop pulling segments while max_pending are in flight
+                if producer is not None and len(pending) < self.max_pending:
+                    waiting.add(producer)
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                if producer in done:
+                    text = producer.result()
+                    done.discard(producer)
+                    if text is None:
+                        producer = None
+                    else:
+                        if progress is not None:
+                            progress.total += 1
+                        pending.add(asyncio.create_task(indexed(index, text)))
+                        index += 1
+                        producer = asyncio.create_task(asyncio.to_thread(next, iterator, None))
+
+                for task in done:
+                    pending.discard(task)
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if producer is not None:
+                producer.cancel()
+
+    def _backoff_delay(self, attempt: int, error: Optional[openai.RateLimitError]) -> float:
+        """Exponential backoff with jitter, honouring a Retry-After header when present."""
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * random.uniform(0.5, 1.0)
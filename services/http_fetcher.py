@@ -0,0 +1,132 @@
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator, Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+import httpx
+from ..utils.lru_cache import LRUCache
+from ..config import (
+    FETCH_TIMEOUT,
+    FETCH_MAX_CONNECTIONS,
+    FETCH_PER_HOST_LIMIT,
+    FETCH_MAX_BYTES,
+    FETCH_CACHE_ENTRIES,
+    FETCH_CACHE_BYTES,
+)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the configured maximum size."""
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    text: str
+
+class _HostLimit:
+    """Concurrency limit for one host and the number of fetches holding or waiting on it."""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+class HttpFetcher:
+    """Async page fetcher with a shared connection pool, per-host limits and revalidation cache.
+
+    Responses carrying an ETag or Last-Modified header are cached; later
+    fetches of the same URL send a conditional request and reuse the cached
+    body on 304 Not Modified. The cache is bounded by the total size of the
+    cached bodies as well as by entry count.
+    """
+
+    def __init__(
+        self,
+        timeout: float = FETCH_TIMEOUT,
+        max_connections: int = FETCH_MAX_CONNECTIONS,
+        per_host_limit: int = FETCH_PER_HOST_LIMIT,
+        max_bytes: int = FETCH_MAX_BYTES,
+        cache_entries: int = FETCH_CACHE_ENTRIES,
+        cache_bytes: int = FETCH_CACHE_BYTES,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.max_bytes = max_bytes
+        self.cache = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Only hosts with fetches in flight have an entry, so crawling many hosts doesn't grow this
+        self._host_limits: Dict[str, _HostLimit] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True
+            )
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the per-host slots for the URL's host, dropping the host's entry once it is idle."""
+        host = urlsplit(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = _HostLimit(self.per_host_limit)
+        limit.users += 1
+        try:
+            async with limit.semaphore:
+                yield
+        finally:
+            limit.users -= 1
+            if limit.users == 0:
+                del self._host_limits[host]
+
+    async def fetch_text(self, url: str) -> str:
+        """Download a page and return its decoded body."""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        async with self._host_slot(url):
+            async with self._get_client().stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and cached is not None:
+                    logging.info(f"Not modified, using cached copy of {url}")
+                    return cached.text
+                response.raise_for_status()
+
+                declared_length = response.headers.get("content-length")
+                if declared_length and declared_length.isdigit() and int(declared_length) > self.max_bytes:
+                    raise ResponseTooLarge(f"Response of {declared_length} bytes exceeds limit of {self.max_bytes}")
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) > self.max_bytes:
+                        raise ResponseTooLarge(f"Response exceeds limit of {self.max_bytes} bytes")
+
+                text = body.decode(response.encoding or "utf-8", errors="replace")
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+
+        if etag or last_modified:
+            self.cache.set(url, CachedResponse(etag, last_modified, text), size=len(body))
+        return text
+
+    async def close(self):
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
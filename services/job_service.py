@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+from .extraction_service import ExtractionProgress
+from .topic_service import TopicService
+from ..models.topic_models import InputType, JobResponse, JobState, TextInput, TopicResponse
+from ..config import JOB_DB_PATH, JOB_WORKERS, JOB_HEARTBEAT_INTERVAL, JOB_LEASE_TIMEOUT, JOB_POLL_INTERVAL
+
+class JobService:
+    """Runs process_input in background workers, with jobs persisted to SQLite.
+
+    Inputs are stored with the job, so work that was queued or running when
+    the process stopped is picked up again on the next start. Results stay in
+    the database until the job is deleted. Several server workers can share
+    the database, which is the queue: idle workers of every instance claim the
+    oldest queued job, so a job submitted to a busy instance is run by an idle
+    one. A job is claimed by one instance at a time, which writes its progress
+    to the job's row every heartbeat, so any worker can report it. A running
+    job whose heartbeat is older than the lease timeout is requeued, since the
+    instance that claimed it has crashed or been restarted.
+    """
+
+    def __init__(
+        self,
+        topic_service: TopicService,
+        db_path: str = JOB_DB_PATH,
+        workers: int = JOB_WORKERS,
+        heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL,
+        lease_timeout: float = JOB_LEASE_TIMEOUT,
+        poll_interval: float = JOB_POLL_INTERVAL,
+    ):
+        self.topic_service = topic_service
+        self.workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        # Identifies this instance as a job's owner; unlike a pid it is never reused after a restart
+        self.instance_id = uuid.uuid4().hex
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, input_type TEXT NOT NULL, content TEXT NOT NULL, "
+            "data BLOB, extract_tables INTEGER NOT NULL DEFAULT 0, chunks_done INTEGER NOT NULL DEFAULT 0, "
+            "chunks_total INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, owner TEXT, heartbeat_at REAL)"
+        )
+        # Databases created before jobs recorded the claiming instance and its heartbeat
+        for column in ("owner TEXT", "heartbeat_at REAL"):
+            try:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass
+        self._db.commit()
+        # Set when this instance queues or requeues a job, so idle workers don't wait out the poll
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+            self._db.commit()
+            return rows
+
+    async def start(self):
+        """Start the workers and requeue jobs interrupted by the last shutdown."""
+        if self._wakeup is not None:
+            return
+        self._wakeup = asyncio.Event()
+        await self._requeue_expired()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+
+    async def stop(self):
+        """Stop the workers; unfinished jobs stay in the database and resume on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+        # Hand this instance's interrupted jobs back to the queue for the next start
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND owner = ?",
+            (JobState.QUEUED.value, JobState.RUNNING.value, self.instance_id)
+        )
+
+    async def submit(self, input_data: TextInput) -> JobResponse:
+        """Persist a job as queued for the workers of any instance."""
+        await self.start()
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO jobs (id, status, input_type, content, data, extract_tables, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, JobState.QUEUED.value, input_data.input_type.value, input_data.content,
+             input_data.data, int(input_data.extract_tables), now, now)
+        )
+        self._wakeup.set()
+        return JobResponse(job_id=job_id, status=JobState.QUEUED)
+
+    async def get(self, job_id: str) -> Optional[JobResponse]:
+        """Return a job's status, progress as of its last heartbeat and, once finished, its result."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT status, chunks_done, chunks_total, result, error FROM jobs WHERE id = ?",
+            (job_id,)
+        )
+        if not rows:
+            return None
+        status, chunks_done, chunks_total, result, error = rows[0]
+        return JobResponse(
+            job_id=job_id,
+            status=JobState(status),
+            chunks_done=chunks_done,
+            chunks_total=chunks_total,
+            result=TopicResponse.model_validate_json(result) if result else None,
+            error=error
+        )
+
+    async def delete(self, job_id: str) -> bool:
+        """Remove a finished job and its stored result."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM jobs WHERE id = ? AND status IN (?, ?) RETURNING id",
+            (job_id, JobState.COMPLETED.value, JobState.FAILED.value)
+        )
+        return bool(rows)
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to claim an extraction job: {str(e)}")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            job_id, input_data = job
+            try:
+                await self._run(job_id, input_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Extraction job {job_id} crashed: {str(e)}", exc_info=True)
+                await asyncio.to_thread(
+                    self._execute,
+                    "UPDATE jobs SET status = ?, error = ?, data = NULL, updated_at = ? WHERE id = ?",
+                    (JobState.FAILED.value, str(e), time.time(), job_id)
+                )
+
+    async def _idle(self):
+        """Wait until this instance queues a job or poll_interval has passed."""
+        wakeup = asyncio.ensure_future(self._wakeup.wait())
+        try:
+            # Not wait_for, which can swallow a cancellation that arrives as it times out
+            await asyncio.wait((wakeup,), timeout=self.poll_interval)
+        finally:
+            wakeup.cancel()
+
+    async def _reaper(self):
+        """Periodically requeue jobs abandoned by crashed instances."""
+        while True:
+            await asyncio.sleep(self.lease_timeout / 3)
+            try:
+                if await self._requeue_expired():
+                    self._wakeup.set()
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to requeue abandoned extraction jobs: {str(e)}")
+
+    async def _requeue_expired(self) -> List[str]:
+        """Mark running jobs whose lease has expired as queued again and return their ids."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, owner = NULL WHERE status = ? "
+            "AND (heartbeat_at IS NULL OR heartbeat_at < ?) RETURNING id",
+            (JobState.QUEUED.value, JobState.RUNNING.value, time.time() - self.lease_timeout)
+        )
+        if rows:
+            logging.info(f"Requeued {len(rows)} extraction jobs whose worker stopped responding")
+        return [job_id for (job_id,) in rows]
+
+    async def _heartbeat(self, job_id: str, progress: ExtractionProgress):
+        """Write the job's progress and renew its lease every heartbeat_interval."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(
+                    self._execute,
+                    "UPDATE jobs SET chunks_done = ?, chunks_total = ?, heartbeat_at = ? WHERE id = ? AND owner = ?",
+                    (progress.done, progress.total, time.time(), job_id, self.instance_id)
+                )
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to record progress of extraction job {job_id}: {str(e)}")
+
+    async def _claim(self) -> Optional[Tuple[str, TextInput]]:
+        """Claim the oldest queued job for this instance; None when the queue is empty."""
+        now = time.time()
+        # One statement, so SQLite's write lock makes the claim atomic across processes
+        rows = await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, owner = ?, heartbeat_at = ?, updated_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) AND status = ? "
+            "RETURNING id, input_type, content, data, extract_tables",
+            (JobState.RUNNING.value, self.instance_id, now, now, JobState.QUEUED.value, JobState.QUEUED.value)
+        )
+        if not rows:
+            return None
+        job_id, input_type, content, data, extract_tables = rows[0]
+        return job_id, TextInput(
+            input_type=InputType(input_type),
+            content=content,
+            data=data,
+            extract_tables=bool(extract_tables)
+        )
+
+    async def _run(self, job_id: str, input_data: TextInput):
+        progress = ExtractionProgress()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, progress))
+        try:
+            response = await self.topic_service.process_input(input_data, progress)
+        finally:
+            heartbeat.cancel()
+
+        status = JobState.COMPLETED if response.status != "error" else JobState.FAILED
+        error = response.message if status == JobState.FAILED else None
+        # The input is no longer needed once the job has finished. If the lease was lost
+        # meanwhile, the job was requeued and its new owner records the result instead.
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, result = ?, error = ?, chunks_done = ?, chunks_total = ?, "
+            "data = NULL, updated_at = ? WHERE id = ? AND owner = ?",
+            (status.value, response.model_dump_json(), error, progress.done, progress.total, time.time(),
+             job_id, self.instance_id)
+        )
+        logging.info(f"Extraction job {job_id} finished with status {status.value}")
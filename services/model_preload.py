@@ -0,0 +1,39 @@
+import gc
+import logging
+import time
+from typing import Dict
+from .embedding_provider import get_embedding_model, resolve_device
+from ..utils.text_chunker import get_pipeline
+from ..config import CHUNKER_MODE, EMBEDDING_BACKEND
+
+def preload_models() -> Dict[str, float]:
+    """Load model weights into this process without running them, returning seconds per model.
+
+    Called in the gunicorn master before it forks, so every worker shares the
+    weight pages copy-on-write instead of loading its own copy. Nothing is
+    encoded here: torch's thread pools and the tokenizers' parallelism must be
+    started by each worker after the fork, not inherited half-initialized.
+    """
+    loaded = {}
+    device = resolve_device()
+    if EMBEDDING_BACKEND != "torch":
+        # An ONNX Runtime session starts its thread pool when created, and threads don't survive fork
+        logging.info(f"Not preloading the {EMBEDDING_BACKEND} embedding model; workers will load it")
+    elif device == "cpu":
+        started = time.perf_counter()
+        get_embedding_model(device=device)
+        loaded["embedding_model"] = time.perf_counter() - started
+    else:
+        # A CUDA context can't cross fork; each worker loads its own copy onto the GPU
+        logging.warning(f"Not preloading the embedding model for device {device}; workers will load it")
+
+    if CHUNKER_MODE != "regex":
+        started = time.perf_counter()
+        get_pipeline(CHUNKER_MODE)
+        loaded["chunker_pipeline"] = time.perf_counter() - started
+
+    # Move everything loaded so far out of the collector's reach; otherwise the first
+    # collection in each worker touches every object header and un-shares the pages
+    gc.collect()
+    gc.freeze()
+    return loaded
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+from ..config import OCR_WORKERS, OCR_MIN_PIXELS, OCR_MAX_SIDE, OCR_TIME_BUDGET
+
+def _ocr_worker(image_bytes: bytes, max_side: int) -> str:
+    """Decode, grayscale, downscale and OCR one image. Runs in a worker process."""
+    # Imported here so only the worker processes pay for them
+    import pytesseract
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image = image.convert("L")
+        if max(image.size) > max_side:
+            image.thumbnail((max_side, max_side))
+        return pytesseract.image_to_string(image)
+    except Exception as e:
+        # Some exceptions (e.g. TesseractNotFoundError) can't be unpickled in the parent,
+        # which marks the whole pool as broken; send back a plain error instead
+        raise RuntimeError(f"{type(e).__name__}: {str(e)}") from None
+
+class OcrService:
+    """OCR stage for images embedded in PDFs."""
+
+    def __init__(
+        self,
+        workers: int = OCR_WORKERS,
+        min_pixels: int = OCR_MIN_PIXELS,
+        max_side: int = OCR_MAX_SIDE,
+        time_budget: float = OCR_TIME_BUDGET,
+    ):
+        # OCR is CPU bound, so more workers than cores only adds contention
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+        self.min_pixels = min_pixels
+        self.max_side = max_side
+        self.time_budget = time_budget
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps workers free of the parent's threads and loaded models
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def collect_images(self, doc) -> List[bytes]:
+        """Return the distinct, large-enough images of an open PyMuPDF document.
+
+        Images are deduplicated by xref (a logo repeated on every page) and by
+        content hash (the same picture embedded twice), and anything under
+        min_pixels is skipped before it is even decoded.
+        """
+        seen_xrefs = set()
+        seen_hashes = set()
+        images = []
+        for page in doc:
+            for img in page.get_images():
+                xref, width, height = img[0], img[2], img[3]
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+                if width * height < self.min_pixels:
+                    continue
+
+                image_bytes = doc.extract_image(xref)["image"]
+                digest = hashlib.sha1(image_bytes).digest()
+                if digest in seen_hashes:
+                    continue
+                seen_hashes.add(digest)
+                images.append(image_bytes)
+        return images
+
+    async def ocr_images(self, images: List[bytes]) -> List[str]:
+        """OCR images in parallel within the per-document time budget, keeping document order."""
+        if not images:
+            return []
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            futures = [
+                loop.run_in_executor(executor, _ocr_worker, image_bytes, self.max_side)
+                for image_bytes in images
+            ]
+        except BrokenProcessPool:
+            # A worker died during an earlier document; start a fresh pool and retry once
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            futures = [
+                loop.run_in_executor(executor, _ocr_worker, image_bytes, self.max_side)
+                for image_bytes in images
+            ]
+        _, pending = await asyncio.wait(futures, timeout=self.time_budget)
+        if pending:
+            logging.warning(
+                f"OCR time budget of {self.time_budget}s exceeded, skipping {len(pending)} of {len(images)} images"
+            )
+            for future in pending:
+                future.cancel()
+
+        texts = []
+        for future in futures:
+            if future.cancelled():
+                continue
+            if isinstance(future.exception(), BrokenProcessPool):
+                # A worker died (e.g. out of memory); replace the pool so later documents still get OCR
+                self._discard_executor(executor)
+            if future.exception() is not None:
+                logging.warning(f"Failed to OCR image: {str(future.exception())}")
+                continue
+            text = future.result()
+            if text.strip():
+                texts.append(text)
+        return texts
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool, unless another call has already replaced it."""
+        if self._executor is executor:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,6 +1,8 @@
 import logging
-from typing import List
+from typing import Optional
 from app.models.topic_models import TopicList
+from app.services.topic_cache import TopicCache
+from app.utils.metrics import CACHE_REQUESTS, timed
 import openai
 import ell
 from openai import OpenAI
@@ -8,19 +10,15 @@ from openai import OpenAI
 # Set the OpenAI API key
 openai.api_key = ""
 
-class OpenAIService:
-    @ell.complex(
-        model="gpt-4o-mini",
-        client=OpenAI(api_key=openai.api_key),
-        temperature=0.75,
-        top_p=1,
-        frequency_penalty=0.0,
-        presence_penalty=0.5,
-        response_format=TopicList
-    )
-    def extract_topics(self, text: str) -> TopicList:
-        return [
-            ell.system(f"""
+MODEL = "gpt-4o-mini"
+MODEL_PARAMS = {
+    "temperature": 0.75,
+    "top_p": 1,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.5,
+}
+
+SYSTEM_PROMPT = """
                 Analyze the provided article to extract topics suitable for creating knowledge capsules. 
                 Each topic should be concise and specific enough to be effectively covered in a 15-minute session. For each topic, 
                 evaluate its relevance, applicability, and current popularity ('hotness').
@@ -60,21 +58,51 @@ class OpenAIService:
                 
 
                 Return the output as a JSON object with the following structure:
-                {{
+                {
                     "topics": [
-                        {{
+                        {
                             "topic": "Topic name (5 words)",
-                            "attributes": {{
+                            "attributes": {
                                 "field": "",
                                 "sub_field": "",
                                 "subject_matter": "",
                                 "relevance": "20 words",
                                 "potential_impact": "20 words",
                                 "hotness": "(High/Medium/Low)"
-                            }}
-                        }}
+                            }
+                        }
                     ]
-                }}
-            """),
+                }
+"""
+
+class OpenAIService:
+    def __init__(self, cache: Optional[TopicCache] = None):
+        self.cache = cache if cache is not None else TopicCache()
+        # Anything that changes the model output must be part of the cache key
+        self._cache_params = {"model": MODEL, "prompt": SYSTEM_PROMPT, **MODEL_PARAMS}
+
+    @ell.complex(
+        model=MODEL,
+        client=OpenAI(api_key=openai.api_key),
+        response_format=TopicList,
+        **MODEL_PARAMS
+    )
+    def extract_topics(self, text: str) -> TopicList:
+        return [
+            ell.system(SYSTEM_PROMPT),
             ell.user(f"Text chunk: {text}")
         ]
+
+    def get_topics(self, text: str) -> TopicList:
+        """Return topics for a text chunk, serving repeated chunks from the cache."""
+        key = TopicCache.make_key(text, self._cache_params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="topics", result="hit")
+            return cached
+
+        CACHE_REQUESTS.inc(cache="topics", result="miss")
+        with timed("llm"):
+            topics = self.extract_topics(text).parsed
+        self.cache.set(key, topics)
+        return topics
@@ -1,114 +1,209 @@
 import time 
+import asyncio
+import base64
+import json
 import logging
 import uuid
-from typing import Dict, List
+import httpx
+import numpy as np
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from fastapi import HTTPException
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, Filter
-from sentence_transformers import SentenceTransformer
-from ..models.topic_models import Topic, TopicAttribute
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    DatetimeRange,
+    Direction,
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    OrderBy,
+    PayloadSchemaType,
+    PointStruct,
+    SearchRequest,
+    VectorParams,
+)
+from ..models.topic_models import Topic, TopicAttribute, TopicFilter
+from .embedding_service import EmbeddingService
+from ..utils.latency import LatencyStats
+from ..utils.lru_cache import LRUCache
+from ..utils.metrics import CACHE_REQUESTS, timed
+from ..config import (
+    UPSERT_BATCH_SIZE,
+    VECTOR_STORE,
+    QDRANT_URL,
+    QDRANT_API_KEY,
+    QDRANT_LOCAL_PATH,
+    QDRANT_TIMEOUT,
+    QDRANT_MAX_CONNECTIONS,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_RESULT_CACHE_SIZE,
+    QUERY_RESULT_CACHE_TTL,
+)
 from datetime import datetime, timezone
-import torch
+
+# Indexed payload fields: filters on these run inside the HNSW traversal instead of
+# post-filtering, and ordering by stored_at requires its datetime index
+PAYLOAD_INDEXES = {
+    "topic": PayloadSchemaType.KEYWORD,
+    "stored_at": PayloadSchemaType.DATETIME,
+    "attributes.field": PayloadSchemaType.KEYWORD,
+    "attributes.hotness": PayloadSchemaType.KEYWORD,
+}
+
+# Payload keys needed to rebuild a Topic and page through results; vectors are never fetched for listings
+TOPIC_PAYLOAD_FIELDS = ["topic", "attributes", "stored_at"]
 
 class QdrantService:
-    def __init__(self):
-        # Initialize Qdrant client with configurable URL and API key
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None, backend: Optional[str] = None):
+        # Initialize Qdrant client for the configured backend
+        self.backend = backend or VECTOR_STORE
         self.client = self._initialize_client()
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.model = SentenceTransformer('all-MiniLM-L6-v2', device=device)  # Load the sentence transformer model
-        self._ensure_collection_exists()
-
-    def _initialize_client(self) -> QdrantClient:
-        """Initialize Qdrant client with configurable URL and API key."""
-        qdrant_url = "https://d3015961-e04b-4057-8be9-21b2f28c9894.europe-west3-0.gcp.cloud.qdrant.io"
-        qdrant_api_key = "tfyVEahRthudwnXUysoDmdGPh-2u-LLmTsdWzdiTsWRBJqyr7nqupA"
+        self.embedding_service = embedding_service or EmbeddingService()
+        # The collection is checked on first use rather than at construction, since that needs the event loop
+        self._collection_ready = False
+        self._collection_lock = asyncio.Lock()
+        # Repeated questions skip the model and, within the TTL, the search itself.
+        # Query vectors get their own LRU so bulk topic embeddings can't evict them.
+        self.query_vectors = LRUCache(max_entries=QUERY_EMBEDDING_CACHE_SIZE)
+        self.query_results = LRUCache(
+            max_entries=QUERY_RESULT_CACHE_SIZE if QUERY_RESULT_CACHE_TTL > 0 else 0,
+            ttl=QUERY_RESULT_CACHE_TTL
+        )
+        # Bumped by every write; a search that overlaps a write doesn't cache its (possibly stale) result
+        self._generation = 0
+        self.query_latency = {"cached": LatencyStats(), "uncached": LatencyStats()}
+
+    def _initialize_client(self) -> AsyncQdrantClient:
+        """Initialize the Qdrant client for the remote, local (embedded on-disk) or memory backend."""
+        if self.backend == "memory":
+            return AsyncQdrantClient(location=":memory:")
+        if self.backend == "local":
+            # Embedded mode: no network hop, data persisted under QDRANT_LOCAL_PATH, one process at a time
+            return AsyncQdrantClient(path=QDRANT_LOCAL_PATH)
+        if self.backend != "remote":
+            raise ValueError(f"Unknown vector store backend '{self.backend}', expected remote, local or memory")
+
+        qdrant_url = QDRANT_URL
+        qdrant_api_key = QDRANT_API_KEY
         if not qdrant_url or not qdrant_api_key:
             raise ValueError("Qdrant URL or API Key is missing")
         
-        return QdrantClient(
+        # One client per process; its httpx pool keeps connections to the cluster alive between requests
+        return AsyncQdrantClient(
             url=qdrant_url,
             api_key=qdrant_api_key,
-            timeout=30  
+            timeout=QDRANT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=QDRANT_MAX_CONNECTIONS,
+                max_keepalive_connections=QDRANT_MAX_CONNECTIONS
+            )
         )
 
-    def _ensure_collection_exists(self):
+    def _invalidate_query_results(self):
+        """Drop cached query results after the collection changes."""
+        self._generation += 1
+        self.query_results.clear()
+
+    @property
+    def collection_ready(self) -> bool:
+        """Whether the collection has been checked (or created) since startup."""
+        return self._collection_ready
+
+    async def warm_up(self):
+        """Connect to Qdrant and make sure the collection exists before the first request needs it."""
+        await self._ensure_collection_exists()
+
+    async def close(self):
+        """Close the pooled connections to Qdrant."""
+        await self.client.close()
+
+    async def _ensure_collection_exists(self):
         """Ensure the 'topics' collection exists with correct vector dimensions and payload index."""
+        if self._collection_ready:
+            return
+        async with self._collection_lock:
+            if self._collection_ready:
+                return
+            await self._create_collection_if_missing()
+            self._collection_ready = True
+
+    async def _create_collection_if_missing(self):
+        """Create the 'topics' collection on the server if it is not there yet."""
         try:
-            collections = self.client.get_collections()
+            collections = await self.client.get_collections()
             if "topics" not in [t.name for t in collections.collections]:
-                self.client.create_collection(
+                await self.client.create_collection(
                     collection_name="topics",
-                    vectors_config=VectorParams(size=384, distance=Distance.COSINE)  # For MiniLM-L6-v2 embeddings
+                    vectors_config=VectorParams(size=self.embedding_service.dimension, distance=Distance.COSINE)
                 )
                 logging.info("Collection 'topics' created successfully.")
             else:
                 logging.info("Collection 'topics' already exists.")
+            if self.backend != "remote":
+                # Embedded Qdrant has no payload indexes; it scans payloads directly
+                return
+            # Creating an index that already exists is a no-op, so this also upgrades older collections
+            for field_name, field_schema in PAYLOAD_INDEXES.items():
+                await self.client.create_payload_index(
+                    collection_name="topics",
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
         except Exception as e:
             logging.error(f"Failed to ensure collection exists: {str(e)}", exc_info=True)
             raise
 
-    def check_topic_exists_with_similarity(self, new_topic: Topic, similarity_threshold: float = 0.7) -> bool:
+    async def check_topic_exists_with_similarity(
+        self,
+        new_topic: Topic,
+        similarity_threshold: float = 0.7,
+        vector: Optional[np.ndarray] = None
+    ) -> bool:
         """Check if a similar topic already exists in the database."""
-        topic_embedding = self.model.encode(new_topic.topic).tolist()
-        results = self.client.search(
-            collection_name="topics",
-            query_vector=topic_embedding,
-            limit=5
-        )
-        
-        for result in results:
-            existing_topic_data = result.payload
-            existing_topic = Topic(
-                topic=existing_topic_data['topic'],
-                attributes=TopicAttribute(**existing_topic_data['attributes'])
+        await self._ensure_collection_exists()
+        if vector is None:
+            vector = await self.embedding_service.aencode(new_topic.topic)
+        # The collection uses cosine distance, so the search score is already the similarity
+        with timed("qdrant_search"):
+            results = await self.client.search(
+                collection_name="topics",
+                query_vector=vector.tolist(),
+                limit=1,
+                score_threshold=similarity_threshold,
+                with_payload=["topic"]
             )
-            similarity_score = self.calculate_similarity(new_topic, existing_topic)
-            if similarity_score >= similarity_threshold:
-                logging.info(f"Similar topic found: {existing_topic.topic} with similarity {similarity_score}")
-                return True
+        
+        if results:
+            logging.info(f"Similar topic found: {results[0].payload['topic']} with similarity {results[0].score}")
+            return True
         return False
 
     def calculate_similarity(self, topic1: Topic, topic2: Topic) -> float:
         """Calculate similarity between two topics based on their attributes."""
-        topic1_vector = self.model.encode(topic1.topic).tolist()
-        topic2_vector = self.model.encode(topic2.topic).tolist()
-        return self._cosine_similarity(topic1_vector, topic2_vector)
+        vectors = self.embedding_service.encode_many([topic1.topic, topic2.topic])
+        return float(np.dot(vectors[0], vectors[1]))
 
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
-        import numpy as np
         return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
 
-    def store_topic(self, topic: Topic) -> Dict:
+    async def store_topic(self, topic: Topic) -> Dict:
         """Store a topic in Qdrant database with similarity check."""
-        if self.check_topic_exists_with_similarity(topic):
+        vector = await self.embedding_service.aencode(topic.topic)
+        if await self.check_topic_exists_with_similarity(topic, vector=vector):
             return {
                 "status": "error",
                 "message": "A similar topic already exists in the database."
             }
         
-        vector = self.model.encode(topic.topic).tolist()
-        payload = {
-            "topic": topic.topic,
-            "attributes": {
-                "field": topic.attributes.field,
-                "sub_field": topic.attributes.sub_field,
-                "subject_matter": topic.attributes.subject_matter,
-                "relevance": topic.attributes.relevance,
-                "potential_impact": topic.attributes.potential_impact,
-                "hotness": topic.attributes.hotness
-            },
-            "stored_at": datetime.now(timezone.utc).isoformat()
-        }
+        payload = self._topic_payload(topic)
 
-        self.client.upsert(
-            collection_name="topics",
-            points=[{
-                "id": str(uuid.uuid4()),  # Unique ID for each topic
-                "payload": payload,
-                "vector": vector         
-            }]
-        )
+        with timed("qdrant_upsert"):
+            await self.client.upsert(
+                collection_name="topics",
+                points=[PointStruct(id=str(uuid.uuid4()), payload=payload, vector=vector.tolist())]
+            )
+        self._invalidate_query_results()
 
         logging.info(f"Successfully stored topic: {topic.topic}")
         return {
@@ -117,14 +212,94 @@ class QdrantService:
             "topic": payload
         }
 
+    async def store_topics(self, topics: List[Topic], similarity_threshold: float = 0.7) -> List[Dict]:
+        """Store many topics with one embedding batch, one batched search and chunked upserts.
+
+        Returns one status dict per input topic, in input order, with the same
+        shape as store_topic.
+        """
+        if not topics:
+            return []
+
+        await self._ensure_collection_exists()
+        vectors = await self.embedding_service.aencode_many([topic.topic for topic in topics])
+        results: List[Optional[Dict]] = [None] * len(topics)
+
+        # Dedupe within the batch: rows are unit-normalized, so the dot product is the cosine similarity
+        similarity = vectors @ vectors.T
+        kept = []
+        for i in range(len(topics)):
+            if kept and similarity[i, kept].max() >= similarity_threshold:
+                results[i] = {
+                    "status": "error",
+                    "message": "A similar topic is already included in this batch."
+                }
+            else:
+                kept.append(i)
+
+        # Check the survivors against the collection in a single round trip
+        with timed("qdrant_search"):
+            responses = await self.client.search_batch(
+                collection_name="topics",
+                requests=[
+                    SearchRequest(
+                        vector=vectors[i].tolist(),
+                        limit=1,
+                        score_threshold=similarity_threshold,
+                        with_payload=["topic"]
+                    )
+                    for i in kept
+                ]
+            )
+
+        points = []
+        for i, hits in zip(kept, responses):
+            if hits:
+                logging.info(f"Similar topic found: {hits[0].payload['topic']} with similarity {hits[0].score}")
+                results[i] = {
+                    "status": "error",
+                    "message": "A similar topic already exists in the database."
+                }
+                continue
+            payload = self._topic_payload(topics[i])
+            points.append(PointStruct(id=str(uuid.uuid4()), payload=payload, vector=vectors[i].tolist()))
+            results[i] = {
+                "status": "success",
+                "message": "Topic stored successfully",
+                "topic": payload
+            }
+
+        for start in range(0, len(points), UPSERT_BATCH_SIZE):
+            with timed("qdrant_upsert"):
+                await self.client.upsert(
+                    collection_name="topics",
+                    points=points[start:start + UPSERT_BATCH_SIZE]
+                )
+        if points:
+            self._invalidate_query_results()
+
+        logging.info(f"Stored {len(points)} of {len(topics)} topics")
+        return results
+
+    def _topic_payload(self, topic: Topic) -> Dict:
+        """Build the Qdrant payload stored alongside a topic vector."""
+        return {
+            "topic": topic.topic,
+            "attributes": topic.attributes.model_dump(),
+            "stored_at": datetime.now(timezone.utc).isoformat()
+        }
+
     async def delete_topic(self, topic_name: str) -> Dict:
         """Delete a topic from Qdrant database by topic name."""
         try:
+            await self._ensure_collection_exists()
             delete_filter = Filter(must=[{"key": "topic", "match": {"value": topic_name}}])
-            await self.client.delete(
-                collection_name="topics",
-                points_selector=delete_filter
-            )
+            with timed("qdrant_delete"):
+                await self.client.delete(
+                    collection_name="topics",
+                    points_selector=delete_filter
+                )
+            self._invalidate_query_results()
             logging.info(f"Successfully deleted topic: {topic_name}")
             return {
                 "status": "success", 
@@ -137,14 +312,53 @@ class QdrantService:
                 "message": f"Failed to delete topic: {str(e)}"
             }
 
-    async def query_topics(self, query: str) -> List[Topic]:
-        """Query the database for topics relevant to the user's question."""
-        query_vector = self.model.encode(query).tolist()
-        results = self.client.search(
-            collection_name="topics",
-            query_vector=query_vector,
-            limit=5
+    async def query_topics(
+        self,
+        query: str,
+        filters: Optional[TopicFilter] = None,
+        limit: int = 5,
+        score_threshold: Optional[float] = None
+    ) -> List[Topic]:
+        """Query the database for topics relevant to the user's question.
+
+        Filters are applied by Qdrant during the vector search, using the
+        payload indexes, so narrowed queries stay fast as the collection grows.
+        Results are cached briefly per query and filters, and dropped on any write
+        made through this instance. The cache is per process: a write made by
+        another server worker only shows up here once QUERY_RESULT_CACHE_TTL
+        has passed.
+        """
+        started = time.perf_counter()
+        query = " ".join(query.split())
+        key = (
+            query,
+            filters.model_dump_json() if filters is not None else None,
+            limit,
+            score_threshold
         )
+        cached = self.query_results.get(key)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="query_results", result="hit")
+            self.query_latency["cached"].record(time.perf_counter() - started)
+            return list(cached)
+        CACHE_REQUESTS.inc(cache="query_results", result="miss")
+
+        await self._ensure_collection_exists()
+        generation = self._generation
+        query_vector = self.query_vectors.get(query)
+        if query_vector is None:
+            query_vector = (await self.embedding_service.aencode(query)).tolist()
+            self.query_vectors.set(query, query_vector)
+        with timed("qdrant_search"):
+            results = await self.client.search(
+                collection_name="topics",
+                query_vector=query_vector,
+                query_filter=self._build_filter(filters),
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=TOPIC_PAYLOAD_FIELDS,
+                with_vectors=False
+            )
         
         topics = []
         for result in results:
@@ -153,37 +367,112 @@ class QdrantService:
                 topic=topic_data['topic'],
                 attributes=TopicAttribute(**topic_data['attributes'])
             ))
-        
-        return topics
 
-    async def get_all_topics(self) -> List[Topic]:
-        """Retrieve all topics from the database, sorted by most recently stored first."""
-        try:
-            topics = []
-            next_page_offset = None
+        if generation == self._generation:
+            self.query_results.set(key, topics)
+        self.query_latency["uncached"].record(time.perf_counter() - started)
+        return list(topics)
 
-            while True:
-                results, next_page_offset = self.client.scroll(
-                    collection_name="topics",
-                    limit=1000,
-                    order_by={"key": "stored_at", "direction": "desc"},
-                    offset=next_page_offset
-                )
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Return hit rates for the query caches and latency for cached and uncached queries."""
+        return {
+            "query_embeddings": self.query_vectors.stats(),
+            "query_results": self.query_results.stats(),
+            "query_latency": {name: stats.stats() for name, stats in self.query_latency.items()}
+        }
 
-                if not results:
-                    break
+    async def get_topics_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[TopicFilter] = None
+    ) -> Tuple[List[Topic], Optional[str]]:
+        """Return one page of topics, most recently stored first, and the cursor for the next page.
+
+        Qdrant can't combine order_by with an offset, so the cursor records the
+        last stored_at value and the ids already returned at that timestamp.
+        """
+        await self._ensure_collection_exists()
+        state = self._decode_cursor(cursor) if cursor else None
+        seen = set(state["seen"]) if state else set()
+
+        with timed("qdrant_scroll"):
+            points, _ = await self.client.scroll(
+                collection_name="topics",
+                scroll_filter=self._build_filter(filters),
+                limit=limit + len(seen),
+                order_by=OrderBy(
+                    key="stored_at",
+                    direction=Direction.DESC,
+                    start_from=datetime.fromisoformat(state["stored_at"]) if state else None
+                ),
+                with_payload=TOPIC_PAYLOAD_FIELDS,
+                with_vectors=False
+            )
+        exhausted = len(points) < limit + len(seen)
+        points = [point for point in points if str(point.id) not in seen][:limit]
 
-                for point in results:
-                    payload = point.payload
-                    topics.append(Topic(
-                        topic=payload['topic'],
-                        attributes=TopicAttribute(**payload['attributes'])
-                    ))
+        topics = [
+            Topic(topic=point.payload['topic'], attributes=TopicAttribute(**point.payload['attributes']))
+            for point in points
+        ]
+        if exhausted or not points:
+            return topics, None
 
-                if not next_page_offset:
-                    break
+        last_stored_at = points[-1].payload['stored_at']
+        next_seen = [str(point.id) for point in points if point.payload['stored_at'] == last_stored_at]
+        if state and state["stored_at"] == last_stored_at:
+            next_seen.extend(seen)
+        return topics, self._encode_cursor({"stored_at": last_stored_at, "seen": next_seen})
 
-            return topics
+    async def iter_topics(
+        self,
+        filters: Optional[TopicFilter] = None,
+        page_size: int = 1000
+    ) -> AsyncIterator[Topic]:
+        """Yield every matching topic, most recent first, fetching one page at a time."""
+        cursor = None
+        while True:
+            topics, cursor = await self.get_topics_page(page_size, cursor, filters)
+            for topic in topics:
+                yield topic
+            if cursor is None:
+                break
+
+    async def get_all_topics(self, filters: Optional[TopicFilter] = None) -> List[Topic]:
+        """Retrieve all topics from the database, sorted by most recently stored first."""
+        try:
+            return [topic async for topic in self.iter_topics(filters)]
         except Exception as e:
             logging.error(f"Error retrieving topics: {str(e)}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+
+    def _build_filter(self, filters: Optional[TopicFilter]) -> Optional[Filter]:
+        """Translate a TopicFilter into a Qdrant payload filter."""
+        if filters is None:
+            return None
+        conditions = []
+        if filters.field:
+            conditions.append(FieldCondition(key="attributes.field", match=MatchValue(value=filters.field)))
+        if filters.hotness:
+            conditions.append(FieldCondition(key="attributes.hotness", match=MatchValue(value=filters.hotness)))
+        if filters.stored_after or filters.stored_before:
+            conditions.append(FieldCondition(
+                key="stored_at",
+                range=DatetimeRange(gte=filters.stored_after, lte=filters.stored_before)
+            ))
+        return Filter(must=conditions) if conditions else None
+
+    @staticmethod
+    def _encode_cursor(state: Dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict:
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(state.get("stored_at"), str) or not isinstance(state.get("seen"), list):
+                raise ValueError("missing fields")
+            return state
+        except (ValueError, AttributeError, TypeError) as e:
+            raise ValueError(f"Invalid pagination cursor: {str(e)}")
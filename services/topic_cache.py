@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+from ..models.topic_models import TopicList
+from ..utils.lru_cache import LRUCache
+from ..config import (
+    TOPIC_CACHE_MAX_ENTRIES,
+    TOPIC_CACHE_TTL,
+    TOPIC_CACHE_DB_PATH,
+    TOPIC_CACHE_DISK_MAX_ENTRIES,
+)
+
+class TopicCache:
+    """Content-addressed cache of extract_topics results.
+
+    Lookups go to an in-process LRU first and then, if configured, to a SQLite
+    file that survives restarts. Disk hits are promoted into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TOPIC_CACHE_MAX_ENTRIES,
+        ttl: float = TOPIC_CACHE_TTL,
+        db_path: Optional[str] = TOPIC_CACHE_DB_PATH,
+        disk_max_entries: int = TOPIC_CACHE_DISK_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.disk_hits = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS topic_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS topic_cache_created_at ON topic_cache (created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, params: Dict) -> str:
+        """Hash the normalized chunk text together with the model and prompt parameters."""
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        digest = hashlib.sha256()
+        digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalized.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[TopicList]:
+        """Return the cached TopicList for a key, or None on a miss."""
+        value = self.memory.get(key)
+        if value is not None or self._db is None:
+            return value
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM topic_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > self.ttl:
+            with self._db_lock:
+                self._db.execute("DELETE FROM topic_cache WHERE key = ?", (key,))
+                self._db.commit()
+            return None
+
+        try:
+            value = TopicList.model_validate_json(row[0])
+        except ValueError:
+            logging.warning(f"Discarding unreadable topic cache entry {key}")
+            return None
+        self.disk_hits += 1
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: TopicList) -> None:
+        """Store a TopicList in memory and, if enabled, on disk."""
+        self.memory.set(key, value)
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO topic_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value.model_dump_json(), time.time())
+            )
+            self._db.commit()
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 100:
+                self._prune_disk()
+                self._writes_since_prune = 0
+
+    def _prune_disk(self) -> None:
+        """Drop expired rows and trim the table to disk_max_entries, oldest first."""
+        self._db.execute("DELETE FROM topic_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        self._db.execute(
+            "DELETE FROM topic_cache WHERE key IN ("
+            "SELECT key FROM topic_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,)
+        )
+        self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for both tiers."""
+        stats = self.memory.stats()
+        stats["disk_enabled"] = self._db is not None
+        stats["disk_hits"] = self.disk_hits
+        # A memory miss that was served from disk is still a cache hit overall
+        stats["misses"] = stats["misses"] - self.disk_hits
+        stats["hits"] = stats["hits"] + self.disk_hits
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -1,48 +1,102 @@
 import json
+import re
+import time
+import asyncio
+import base64
 from fastapi import HTTPException
 from .openai_service import OpenAIService
+from .extraction_service import ExtractionService, ExtractionProgress
 from .qdrant_service import QdrantService
 from .content_service import ContentService
 from .embedding_service import EmbeddingService
-from ..utils.text_chunker import TextChunker
-from ..models.topic_models import TopicAttribute, TopicResponse, TextInput, InputType, Topic
-from typing import List, Tuple, Dict
+from ..utils.text_chunker import TextChunker, get_pipeline
+from ..utils.similarity import suppress_near_duplicates
+from ..utils.metrics import SEGMENTS, collect_timings, timed
+from ..models.topic_models import TopicAttribute, TopicResponse, TextInput, InputType, Topic, UrlTopicResponse
+from ..config import URL_BATCH_CONCURRENCY, DEDUP_SIMILARITY_THRESHOLD, CHUNKER_MODE
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Dict, Union
 import logging
 
+HOTNESS_RANKS = {"high": 3, "medium": 2, "low": 1}
+_RELEVANCE_SCORE = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*10')
+
 class TopicService:
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(
+        self,
+        openai_service: Optional[OpenAIService] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        qdrant_service: Optional[QdrantService] = None
+    ):
+        self.openai_service = openai_service or OpenAIService()
+        self.extraction_service = ExtractionService(self.openai_service)
         self.content_service = ContentService()
-        self.embedding_service = EmbeddingService()
-        self.qdrant_service = QdrantService()
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.qdrant_service = qdrant_service or QdrantService(self.embedding_service)
+
+    async def warm_up_models(self) -> Dict[str, float]:
+        """Load the embedding model and the chunking pipeline, returning seconds per step.
+
+        Runs after boot so the first request doesn't pay for model loading.
+        """
+        steps = {}
+        started = time.perf_counter()
+        # One encode also triggers the model's lazy one-off setup, not just the weight load
+        await self.embedding_service.aencode("warm up")
+        steps["embedding_model"] = time.perf_counter() - started
+        if CHUNKER_MODE != "regex":
+            started = time.perf_counter()
+            await asyncio.to_thread(get_pipeline, CHUNKER_MODE)
+            steps["chunker_pipeline"] = time.perf_counter() - started
+        return steps
+
+    async def close(self):
+        """Release the Qdrant and HTTP connection pools and stop the OCR workers."""
+        await self.qdrant_service.close()
+        self.extraction_service.close()
+        await self.content_service.close()
 
-    async def process_input(self, input_data: TextInput) -> TopicResponse:
-        """Process input data, extract topics, and optionally store them in Qdrant."""
+    async def process_input(
+        self,
+        input_data: TextInput,
+        progress: Optional[ExtractionProgress] = None,
+        include_timings: bool = False
+    ) -> TopicResponse:
+        """Process input data, extract topics, and optionally store them in Qdrant.
+
+        If a progress tracker is given, it counts the chunks, tables and image
+        texts scheduled and finished. With include_timings, the response carries
+        the seconds spent in each pipeline stage.
+        """
+        with collect_timings() as timings, timed("total"):
+            response = await self._process_input(input_data, progress)
+        if include_timings:
+            response.timings = dict(timings)
+        return response
+
+    async def _process_input(
+        self,
+        input_data: TextInput,
+        progress: Optional[ExtractionProgress] = None
+    ) -> TopicResponse:
         try:
             # Extract content based on input type
             text, tables, images = await self._extract_content(input_data)
             
-            # Chunk text for more granular topic extraction
-            chunks = TextChunker.chunk_text(text, 1000)
-            
-            # Extract topics from text chunks
-            all_topics = []
-            for chunk in chunks:
-                topics_result = self.openai_service.extract_topics(chunk)
-                all_topics.extend(topics_result.parsed.topics)
+            # Chunk text lazily so the first LLM calls start while the rest is still being parsed
+            chunks = TextChunker.iter_chunks(text, 1000)
             
-            # Extract topics from tables if present
-            if tables:
-                table_topics = self._process_tables(tables)
-                all_topics.extend(table_topics)
+            # Extract topics from text chunks, tables and image text concurrently
+            with timed("topic_extraction"):
+                chunk_topics, table_topics, image_topics = await asyncio.gather(
+                    self._process_chunks(chunks, progress),
+                    self._process_tables(tables, progress),
+                    self._process_images(images, progress)
+                )
+            all_topics = chunk_topics + table_topics + image_topics
             
-            # Extract topics from images if present
-            if images:
-                image_topics = self._process_images(images)
-                all_topics.extend(image_topics)
-            
-            # Remove duplicate topics
-            unique_topics = self._remove_duplicates(all_topics)
+            # Remove exact duplicates, then paraphrases of the same topic
+            with timed("dedup"):
+                unique_topics = await self._remove_near_duplicates(self._remove_duplicates(all_topics))
             
             return TopicResponse(
                 topics=unique_topics,
@@ -57,6 +111,69 @@ class TopicService:
                 message=f"Error processing input: {str(e)}",
                 status="error"
             )
+    async def stream_input(self, input_data: TextInput) -> AsyncIterator[Dict]:
+        """Yield each chunk's topics as soon as they are extracted, then a deduplicated summary.
+
+        Events are dicts: {"event": "topics", "source", "index", "topics"} per
+        chunk, table or image text in completion order, followed by
+        {"event": "summary", ...} with the same topics process_input returns,
+        or {"event": "error", "message"} if extraction fails.
+        """
+        try:
+            text, tables, images = await self._extract_content(input_data)
+            chunks = TextChunker.iter_chunks(text, 1000)
+
+            sources = []
+
+            def segments():
+                for source, items in (("chunk", chunks), ("table", tables), ("image", images)):
+                    for item in items:
+                        sources.append(source)
+                        SEGMENTS.inc(source=source)
+                        yield item
+
+            results = {}
+            async for index, topics in self.extraction_service.extract_as_completed(segments()):
+                results[index] = topics
+                yield {
+                    "event": "topics",
+                    "source": sources[index],
+                    "index": index,
+                    "topics": [topic.model_dump() for topic in topics]
+                }
+
+            # Restore document order so the summary matches the non-streaming response
+            all_topics = [topic for index in range(len(results)) for topic in results[index]]
+            with timed("dedup"):
+                unique_topics = await self._remove_near_duplicates(self._remove_duplicates(all_topics))
+            yield {
+                "event": "summary",
+                "topics": [topic.model_dump() for topic in unique_topics],
+                "message": "Topics extracted successfully",
+                "status": "success"
+            }
+        except Exception as e:
+            logging.error(f"Error in stream_input: {str(e)}", exc_info=True)
+            yield {"event": "error", "message": f"Error processing input: {str(e)}", "status": "error"}
+
+    async def process_urls(self, urls: List[str]) -> List[UrlTopicResponse]:
+        """Extract topics from many URLs concurrently, returning one result per URL in input order.
+
+        Fetching is bounded per batch; topic extraction shares the process-wide
+        LLM concurrency limit with every other request.
+        """
+        semaphore = asyncio.Semaphore(URL_BATCH_CONCURRENCY)
+
+        async def process(url: str) -> TopicResponse:
+            async with semaphore:
+                return await self.process_input(TextInput(input_type=InputType.URL, content=url))
+
+        # Repeated URLs in a batch are processed once
+        unique_urls = list(dict.fromkeys(urls))
+        responses = await asyncio.gather(*(process(url) for url in unique_urls))
+        by_url = dict(zip(unique_urls, responses))
+        return [UrlTopicResponse(url=url, **by_url[url].model_dump()) for url in urls]
+
     def _is_similar_topic(self, new_topic: Topic, existing_topics: List[Topic]) -> bool:
         """Check if the new topic is similar to any existing topics."""
         for existing_topic in existing_topics:
@@ -87,44 +204,69 @@ class TopicService:
             unique_topics.append(topic)
 
      return unique_topics
-        
 
-    async def _extract_content(self, input_data: TextInput) -> Tuple[str, List[str], List[str]]:
-        """Extract text, tables, and images based on input type."""
+    async def _remove_near_duplicates(self, topics: List[Topic]) -> List[Topic]:
+        """Drop paraphrased topics whose titles embed within the similarity threshold.
+
+        All titles are embedded in one batch; of each group of near-duplicates
+        the highest-rated topic is kept, and survivors keep their original order.
+        """
+        if len(topics) < 2:
+            return topics
+        vectors = await self.embedding_service.aencode_many([topic.topic for topic in topics])
+        scores = [self._topic_rating(topic) for topic in topics]
+        kept = suppress_near_duplicates(vectors, scores, DEDUP_SIMILARITY_THRESHOLD)
+        return [topics[i] for i in kept]
+
+    @staticmethod
+    def _topic_rating(topic: Topic) -> float:
+        """Rank topics by hotness, then by a relevance score if the LLM gave one (e.g. "8/10")."""
+        hotness = topic.attributes.hotness.lower()
+        rank = next((value for label, value in HOTNESS_RANKS.items() if label in hotness), 0)
+        match = _RELEVANCE_SCORE.search(topic.attributes.relevance)
+        relevance = min(float(match.group(1)), 10.0) if match else 0.0
+        return rank * 100 + relevance
+
+    async def _extract_content(self, input_data: TextInput) -> Tuple[Union[str, List[str]], List[str], List[str]]:
+        """Extract text (or page texts), tables, and image text based on input type."""
         if input_data.input_type == InputType.TEXT:
             return input_data.content, [], []
         elif input_data.input_type == InputType.URL:
             text, tables = await self.content_service.extract_text_from_url(input_data.content)
             return text, tables, []
         elif input_data.input_type == InputType.PDF:
-            return await self.content_service.extract_text_from_pdf(input_data.content)
+            if input_data.data is not None:
+                pdf_bytes = input_data.data
+            else:
+                try:
+                    pdf_bytes = base64.b64decode(input_data.content)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=f"Failed to process PDF: {str(e)}")
+            return await self.content_service.extract_pdf_content(pdf_bytes, input_data.extract_tables)
         else:
             raise ValueError(f"Unsupported input type: {input_data.input_type}")
 
-    def _process_tables(self, tables: List[str]) -> List[Topic]:
+    async def _process_chunks(self, chunks: Iterable[str], progress: Optional[ExtractionProgress] = None) -> List[Topic]:
+        """Process text chunks to extract relevant topics."""
+        results = await self.extraction_service.extract_iter(chunks, progress)
+        SEGMENTS.inc(len(results), source="chunk")
+        return [topic for topics in results for topic in topics]
+
+    async def _process_tables(self, tables: List[str], progress: Optional[ExtractionProgress] = None) -> List[Topic]:
         """Process table data to extract relevant concepts."""
-        topics = []
-        for table in tables:
-            table_topics_result = self.openai_service.extract_topics(table)
-            topics.extend(table_topics_result.parsed.topics)
-        return topics
-
-    def _process_images(self, images: List[str]) -> List[Topic]:
-        """Process image data to extract relevant topics."""
-        topics = []
-        for image in images:
-            extracted_text =  self.content_service.extract_text_from_pdf(image)
-            image_topics_result =  self.openai_service.extract_topics(extracted_text)
-            topics.extend(image_topics_result.parsed.topics)
-        return topics
+        results = await self.extraction_service.extract_many(tables, progress)
+        SEGMENTS.inc(len(results), source="table")
+        return [topic for topics in results for topic in topics]
+
+    async def _process_images(self, images: List[str], progress: Optional[ExtractionProgress] = None) -> List[Topic]:
+        """Process OCR text from images to extract relevant topics."""
+        results = await self.extraction_service.extract_many(images, progress)
+        SEGMENTS.inc(len(results), source="image")
+        return [topic for topics in results for topic in topics]
 
     async def store_selected_topics(self, selected_topics: List[Topic]) -> Dict:
         """Store selected topics with similarity check."""
-        storage_results = []
-        
-        for topic in selected_topics:
-            result = self.qdrant_service.store_topic(topic)
-            storage_results.append(result)
+        storage_results = await self.qdrant_service.store_topics(selected_topics)
         
         successful_topics = [
             result['topic'] for result in storage_results 
@@ -0,0 +1,14 @@
+"""Make the repository importable as the app package when pytest runs from inside it."""
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "app" not in sys.modules and importlib.util.find_spec("app") is None:
+    spec = importlib.util.spec_from_file_location(
+        "app", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["app"] = module
+    spec.loader.exec_module(module)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("optimum.onnxruntime")
+
+from app.benchmarks.bench_embeddings import TOLERANCE, encode
+from app.config import EMBEDDING_MODEL
+from app.services.embedding_provider import get_embedding_model
+
+SENTENCES = [
+    "Solid-state batteries promise faster charging and higher energy density.",
+    "Quantum error correction is the main obstacle to useful quantum computers.",
+    "Edge AI accelerators bring on-device inference to phones and cameras.",
+    "CRISPR base editing changes single letters of DNA without cutting both strands.",
+    "Central banks are testing digital currencies for retail payments.",
+    "Heat pumps cut home heating emissions even in cold climates.",
+    "Vector databases index embeddings for fast similarity search.",
+    "Federated learning trains models without collecting raw user data.",
+    "Perovskite solar cells are approaching silicon efficiency at lower cost.",
+    "Large language models can extract structured topics from articles.",
+    "",
+    "AI",
+]
+
+@pytest.fixture(scope="module")
+def torch_vectors() -> np.ndarray:
+    return encode(get_embedding_model(EMBEDDING_MODEL, "cpu", "torch"), SENTENCES, 32)
+
+@pytest.mark.parametrize("backend", ["onnx", "onnx-int8"])
+def test_onnx_backends_match_torch(backend, torch_vectors):
+    vectors = encode(get_embedding_model(EMBEDDING_MODEL, "cpu", backend), SENTENCES, 32)
+    assert vectors.shape == torch_vectors.shape
+    cosine = np.sum(torch_vectors * vectors, axis=1)
+    # TOLERANCE is 0.9999 for onnx and 0.98 for the int8-quantized model
+    assert cosine.min() >= TOLERANCE[backend], f"lowest cosine {cosine.min():.6f} for {SENTENCES[cosine.argmin()]!r}"
@@ -0,0 +1,21 @@
+import pytest
+from app.services import embedding_provider
+
+@pytest.mark.parametrize("machine, flags, expected", [
+    ("aarch64", set(), "onnx/model_qint8_arm64.onnx"),
+    ("arm64", set(), "onnx/model_qint8_arm64.onnx"),
+    ("x86_64", {"avx2", "avx512f", "avx512_vnni"}, "onnx/model_qint8_avx512_vnni.onnx"),
+    ("x86_64", {"avx2", "avx512f"}, "onnx/model_qint8_avx512.onnx"),
+    ("x86_64", {"avx2"}, "onnx/model_quint8_avx2.onnx"),
+])
+def test_int8_file_matches_the_cpu(monkeypatch, machine, flags, expected):
+    monkeypatch.setattr(embedding_provider, "EMBEDDING_ONNX_FILE", "")
+    monkeypatch.setattr(embedding_provider.platform, "machine", lambda: machine)
+    monkeypatch.setattr(embedding_provider, "_cpu_flags", lambda: flags)
+    assert embedding_provider.onnx_file("onnx-int8") == expected
+
+def test_fp32_file_and_override(monkeypatch):
+    monkeypatch.setattr(embedding_provider, "EMBEDDING_ONNX_FILE", "")
+    assert embedding_provider.onnx_file("onnx") == "onnx/model.onnx"
+    monkeypatch.setattr(embedding_provider, "EMBEDDING_ONNX_FILE", "onnx/model_O4.onnx")
+    assert embedding_provider.onnx_file("onnx-int8") == "onnx/model_O4.onnx"
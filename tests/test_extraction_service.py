@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import openai
+import pytest
+from app.benchmarks.fake_llm import FakeOpenAIService
+from app.services.extraction_service import ExtractionService
+from app.utils.metrics import collect_timings
+
+class CountingFake(FakeOpenAIService):
+    """FakeOpenAIService that records how many calls run at once, with optional per-call latencies."""
+
+    def __init__(self, latencies=None, errors=None, **kwargs):
+        super().__init__(**kwargs)
+        self.latencies = list(latencies or [])
+        self.errors = list(errors or [])
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def extract_topics(self, text: str):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            latency = self.latencies.pop(0) if self.latencies else None
+            error = self.errors.pop(0) if self.errors else None
+        try:
+            if latency is not None:
+                time.sleep(latency)
+            if error is not None:
+                raise error
+            return super().extract_topics(text)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+def rate_limit_error() -> openai.RateLimitError:
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+def test_extract_many_runs_in_parallel_and_keeps_order():
+    texts = [f"chunk number {i} about solar panels and batteries" for i in range(8)]
+
+    async def run():
+        fake = CountingFake(latency=0.2)
+        service = ExtractionService(fake, concurrency=8)
+        started = time.perf_counter()
+        results = await service.extract_many(texts)
+        return fake, results, time.perf_counter() - started
+
+    fake, results, elapsed = asyncio.run(run())
+    expected = [FakeOpenAIService(latency=0).extract_topics(text).parsed.topics for text in texts]
+    assert results == expected
+    assert fake.max_active > 1
+    assert elapsed < 8 * 0.2 / 2
+
+def test_concurrency_is_bounded():
+    async def run():
+        fake = CountingFake(latency=0.05)
+        service = ExtractionService(fake, concurrency=3)
+        await service.extract_many([f"text {i}" for i in range(12)])
+        return fake
+
+    fake = asyncio.run(run())
+    assert fake.calls == 12
+    assert fake.max_active == 3
+
+def test_timed_out_call_keeps_its_slot_and_is_retried():
+    async def run():
+        # The first call outlives the timeout; its retry must wait for it to return
+        fake = CountingFake(latency=0, latencies=[0.5])
+        service = ExtractionService(fake, concurrency=1, timeout=0.1, max_retries=2, backoff_base=0.01)
+        topics = await service.extract("a slow chunk about fusion reactors")
+        return fake, topics
+
+    fake, topics = asyncio.run(run())
+    assert topics
+    assert fake.calls == 2
+    assert fake.max_active == 1
+
+def test_timeout_raises_after_retries():
+    async def run():
+        fake = CountingFake(latency=0, latencies=[0.3, 0.3])
+        service = ExtractionService(fake, concurrency=2, timeout=0.05, max_retries=1, backoff_base=0.01)
+        await service.extract("a chunk that never finishes in time")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+
+def test_rate_limit_is_retried():
+    async def run():
+        fake = CountingFake(latency=0, errors=[rate_limit_error(), rate_limit_error()])
+        service = ExtractionService(fake, concurrency=2, max_retries=3, backoff_base=0.01)
+        return fake, await service.extract("a chunk about quantum computing")
+
+    fake, topics = asyncio.run(run())
+    assert topics
+    assert fake.calls == 3
+
+def test_rate_limit_raises_after_retries():
+    async def run():
+        fake = CountingFake(latency=0, errors=[rate_limit_error()] * 3)
+        service = ExtractionService(fake, concurrency=2, max_retries=2, backoff_base=0.01)
+        await service.extract("a chunk about quantum computing")
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(run())
+
+def test_llm_calls_do_not_use_the_default_executor():
+    async def run():
+        # A one-thread default pool, as chunking and parsing would see on a small machine
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+        fake = CountingFake(latency=0.2)
+        service = ExtractionService(fake, concurrency=4)
+        blocker = asyncio.to_thread(time.sleep, 0.2)
+        started = time.perf_counter()
+        await asyncio.gather(blocker, service.extract_many([f"text {i}" for i in range(4)]))
+        service.close()
+        return fake, time.perf_counter() - started
+
+    fake, elapsed = asyncio.run(run())
+    assert fake.max_active == 4
+    assert elapsed < 0.35
+
+def test_llm_time_is_recorded_in_the_request_timings():
+    async def run():
+        service = ExtractionService(CountingFake(latency=0.05), concurrency=2)
+        with collect_timings() as timings:
+            await service.extract_many(["first text", "second text"])
+        service.close()
+        return timings
+
+    timings = asyncio.run(run())
+    assert timings["llm"] >= 0.1
@@ -0,0 +1,29 @@
+import pytest
+from app.benchmarks.bench_html import CORPUS_DIR, load_corpus
+from app.utils.html_extractor import EXTRACTORS, extract_html
+
+BACKENDS = list(EXTRACTORS)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page", sorted(load_corpus(CORPUS_DIR)))
+def test_corpus_matches_bs4(backend, page):
+    html = load_corpus(CORPUS_DIR)[page]
+    assert extract_html(html, backend) == extract_html(html, "bs4")
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("html", ["", "<!-- only a comment -->", "<html><body><!-- removed --></body></html>"])
+def test_empty_documents(backend, html):
+    assert extract_html(html, backend) == ("", [])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_xml_declaration(backend):
+    html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>Release notes</p></body></html>'
+    assert extract_html(html, backend) == ("Release notes", [])
+
+@pytest.mark.parametrize("backend", ["lxml", "stream"])
+@pytest.mark.parametrize("html, expected", [
+    ("<body><p>a<p>b<table><tr><td>x</td></tr></table></body>", ("a b", ["x"])),
+    ("<body><p>a<h2>b</h2>c</body>", ("a b", [])),
+])
+def test_unclosed_paragraph_ends_at_next_block(backend, html, expected):
+    assert extract_html(html, backend) == expected
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.services.content_service import ContentService
+from app.services.http_fetcher import HttpFetcher, ResponseTooLarge
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves the test pages; counters live on the server."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/page"):
+            etag = f'"{self.path}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                server.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = f"<p>{self.path}</p>".encode() * 100
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/big-declared":
+            self.send_response(200)
+            self.send_header("Content-Length", "5000")
+            self.end_headers()
+            self.wfile.write(b"x" * 5000)
+        elif self.path == "/big-undeclared":
+            # HTTP/1.0 without Content-Length: the body runs until the connection closes
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"x" * 5000)
+        elif self.path.startswith("/slow"):
+            with server.lock:
+                server.active += 1
+                server.max_active = max(server.max_active, server.active)
+            time.sleep(0.1)
+            with server.lock:
+                server.active -= 1
+            body = b"done"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.not_modified = 0
+    httpd.active = 0
+    httpd.max_active = 0
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def fetch_all(fetcher: HttpFetcher, urls):
+    async def run():
+        try:
+            return await asyncio.gather(*(fetcher.fetch_text(url) for url in urls), return_exceptions=True)
+        finally:
+            await fetcher.close()
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("path", ["/big-declared", "/big-undeclared"])
+def test_size_cap(server, path):
+    [result] = fetch_all(HttpFetcher(max_bytes=1000), [base_url(server) + path])
+    assert isinstance(result, ResponseTooLarge)
+
+def test_revalidation_reuses_cached_body_on_304(server):
+    fetcher = HttpFetcher()
+    url = base_url(server) + "/page"
+
+    async def run():
+        try:
+            return await fetcher.fetch_text(url), await fetcher.fetch_text(url)
+        finally:
+            await fetcher.close()
+
+    first, second = asyncio.run(run())
+    assert first == second == "<p>/page</p>" * 100
+    assert server.not_modified == 1
+
+def test_revalidation_cache_is_bounded_by_bytes(server):
+    # Each page body is 1300 bytes, so only two fit
+    fetcher = HttpFetcher(cache_bytes=3000)
+    fetch_all(fetcher, [base_url(server) + f"/page{i}" for i in range(4)])
+    assert len(fetcher.cache) == 2
+    assert fetcher.cache.total_bytes <= 3000
+
+def test_per_host_limit(server):
+    fetcher = HttpFetcher(per_host_limit=2)
+    results = fetch_all(fetcher, [base_url(server) + f"/slow{i}" for i in range(6)])
+    assert results == ["done"] * 6
+    assert server.max_active == 2
+    # Idle hosts don't keep an entry
+    assert fetcher._host_limits == {}
+
+def test_closing_one_content_service_leaves_others_open(server):
+    async def run():
+        first, second = ContentService(), ContentService()
+        await first.extract_text_from_url(base_url(server) + "/page")
+        await second.extract_text_from_url(base_url(server) + "/page")
+        await first.close()
+        client = second.http_fetcher._client
+        text, _ = await second.extract_text_from_url(base_url(server) + "/page")
+        open_after = second.http_fetcher._client is client and not client.is_closed
+        await second.close()
+        return text, open_after
+
+    text, open_after = asyncio.run(run())
+    assert text.startswith("page page")
+    assert open_after
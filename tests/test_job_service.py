@@ -0,0 +1,102 @@
+import asyncio
+from app.models.topic_models import InputType, JobState, TextInput, TopicResponse
+from app.services.job_service import JobService
+
+class SlowTopicService:
+    """process_input stand-in that finishes one chunk every step seconds."""
+
+    def __init__(self, chunks: int = 10, step: float = 0.05):
+        self.chunks = chunks
+        self.step = step
+        self.calls = 0
+
+    async def process_input(self, input_data, progress=None):
+        self.calls += 1
+        progress.total += self.chunks
+        for _ in range(self.chunks):
+            await asyncio.sleep(self.step)
+            progress.done += 1
+        return TopicResponse(topics=[], message="Topics extracted", status="success")
+
+def text_input() -> TextInput:
+    return TextInput(input_type=InputType.TEXT, content="some text about batteries")
+
+async def wait_for_status(service: JobService, job_id: str, status: JobState, timeout: float = 5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        job = await service.get(job_id)
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not reach {status.value}")
+
+def test_progress_is_visible_from_another_instance(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def run():
+        owner = JobService(SlowTopicService(chunks=20), db_path=db_path, heartbeat_interval=0.05)
+        # A second worker process sharing the database; it never runs the job itself
+        other = JobService(SlowTopicService(), db_path=db_path, workers=0)
+        job = await owner.submit(text_input())
+        await wait_for_status(other, job.job_id, JobState.RUNNING)
+        await asyncio.sleep(0.4)
+        midway = await other.get(job.job_id)
+        done = await wait_for_status(other, job.job_id, JobState.COMPLETED)
+        await owner.stop()
+        return midway, done
+
+    midway, done = asyncio.run(run())
+    assert midway.status == JobState.RUNNING
+    assert midway.chunks_total == 20
+    assert 0 < midway.chunks_done < 20
+    assert (done.chunks_done, done.chunks_total) == (20, 20)
+
+def test_job_of_a_dead_instance_is_requeued_after_its_lease(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def run():
+        crashed = JobService(SlowTopicService(chunks=100), db_path=db_path, heartbeat_interval=0.05)
+        job = await crashed.submit(text_input())
+        await wait_for_status(crashed, job.job_id, JobState.RUNNING)
+        # Simulate a crash: the tasks die without stop() handing the job back
+        for task in crashed._tasks:
+            task.cancel()
+        await asyncio.gather(*crashed._tasks, return_exceptions=True)
+
+        topic_service = SlowTopicService(chunks=2)
+        survivor = JobService(topic_service, db_path=db_path, heartbeat_interval=0.05, lease_timeout=0.3)
+        await survivor.start()
+        still_running = await survivor.get(job.job_id)
+        done = await wait_for_status(survivor, job.job_id, JobState.COMPLETED)
+        await survivor.stop()
+        return still_running, done, topic_service.calls
+
+    still_running, done, calls = asyncio.run(run())
+    # The lease hadn't expired yet when the survivor started
+    assert still_running.status == JobState.RUNNING
+    assert done.status == JobState.COMPLETED
+    assert calls == 1
+
+def test_idle_instance_claims_jobs_queued_on_a_busy_one(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def run():
+        busy_service, idle_service = SlowTopicService(chunks=40), SlowTopicService(chunks=2)
+        busy = JobService(busy_service, db_path=db_path, workers=1, heartbeat_interval=0.05, poll_interval=0.05)
+        idle = JobService(idle_service, db_path=db_path, workers=1, heartbeat_interval=0.05, poll_interval=0.05)
+        await idle.start()
+        first = await busy.submit(text_input())
+        await wait_for_status(busy, first.job_id, JobState.RUNNING)
+        # busy's only worker is occupied, so only idle can run this one
+        second = await busy.submit(text_input())
+        done = await wait_for_status(busy, second.job_id, JobState.COMPLETED)
+        first_status = (await busy.get(first.job_id)).status
+        await busy.stop()
+        await idle.stop()
+        return done, first_status, busy_service.calls, idle_service.calls
+
+    done, first_status, busy_calls, idle_calls = asyncio.run(run())
+    assert done.chunks_done == 2
+    assert first_status == JobState.RUNNING
+    assert (busy_calls, idle_calls) == (1, 1)
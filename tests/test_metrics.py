@@ -0,0 +1,33 @@
+import json
+import os
+from app.utils.metrics import MetricsRegistry
+
+def make_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter("segments_total", "Segments", ("source",))
+    registry.histogram("stage_seconds", "Stages", ("stage",), buckets=(0.1,))
+    return registry
+
+def test_render_merges_the_metrics_other_workers_wrote(tmp_path):
+    # Another worker's registry, saved under its pid
+    other = make_registry()
+    other.counter("segments_total", "Segments", ("source",)).inc(source="url")
+    other.histogram("stage_seconds", "Stages", ("stage",)).observe(0.05, stage="llm")
+    (tmp_path / "4242.json").write_text(json.dumps(other.snapshot()))
+
+    registry = make_registry()
+    registry.counter("segments_total", "Segments", ("source",)).inc(3, source="url")
+    registry.write(str(tmp_path))
+    lines = registry.render(str(tmp_path)).splitlines()
+
+    pid = os.getpid()
+    assert sorted(os.listdir(tmp_path)) == sorted(["4242.json", f"{pid}.json"])
+    assert f'segments_total{{source="url",pid="{pid}"}} 3.0' in lines
+    assert 'segments_total{source="url",pid="4242"} 1.0' in lines
+    assert 'stage_seconds_bucket{stage="llm",pid="4242",le="0.1"} 1' in lines
+    assert lines.count("# TYPE segments_total counter") == 1
+
+def test_render_without_a_directory_reports_this_process():
+    registry = make_registry()
+    registry.counter("segments_total", "Segments", ("source",)).inc(source="text")
+    assert f'segments_total{{source="text",pid="{os.getpid()}"}} 1.0' in registry.render(None).splitlines()
@@ -0,0 +1,71 @@
+import asyncio
+from app.benchmarks.fakes import HashEmbeddingService
+from app.models.topic_models import Topic, TopicAttribute
+from app.services import qdrant_service as qdrant_module
+from app.services.qdrant_service import QdrantService
+
+def make_topic(title: str) -> Topic:
+    return Topic(
+        topic=title,
+        attributes=TopicAttribute(
+            field="AI",
+            sub_field="Testing",
+            subject_matter="Vectors",
+            relevance="5/10",
+            potential_impact="Unknown",
+            hotness="High"
+        )
+    )
+
+TITLES = [
+    "quantum error correction codes",
+    "solid state battery chemistry",
+    "edge inference on microcontrollers",
+    "genome editing delivery vectors",
+    "privacy preserving federated analytics",
+]
+
+async def stored_titles(service: QdrantService) -> set:
+    return {topic.topic for topic in await service.get_all_topics()}
+
+def test_store_topics_dedupes_within_batch_and_against_collection(monkeypatch):
+    # Small upsert chunks so a single call spans several upserts
+    monkeypatch.setattr(qdrant_module, "UPSERT_BATCH_SIZE", 2)
+
+    async def run():
+        service = QdrantService(HashEmbeddingService(), backend="memory")
+        first = await service.store_topics([make_topic(title) for title in TITLES[:3]] + [make_topic(TITLES[0])])
+        second = await service.store_topics([make_topic(TITLES[1]), make_topic(TITLES[3]), make_topic(TITLES[4])])
+        return first, second, await stored_titles(service)
+
+    first, second, titles = asyncio.run(run())
+    assert [result["status"] for result in first] == ["success", "success", "success", "error"]
+    assert first[3]["message"] == "A similar topic is already included in this batch."
+    assert [result["status"] for result in second] == ["error", "success", "success"]
+    assert second[0]["message"] == "A similar topic already exists in the database."
+    assert [result["topic"]["topic"] for result in first[:3]] == TITLES[:3]
+    assert titles == set(TITLES)
+
+def test_store_topics_empty_batch():
+    async def run():
+        service = QdrantService(HashEmbeddingService(), backend="memory")
+        return await service.store_topics([])
+
+    assert asyncio.run(run()) == []
+
+def test_store_topic_and_store_topics_share_dedup():
+    async def run():
+        service = QdrantService(HashEmbeddingService(), backend="memory")
+        single = await service.store_topic(make_topic(TITLES[0]))
+        repeated = await service.store_topic(make_topic(TITLES[0]))
+        batch = await service.store_topics([make_topic(TITLES[0]), make_topic(TITLES[1])])
+        after_batch = await service.store_topic(make_topic(TITLES[1]))
+        return single, repeated, batch, after_batch, await stored_titles(service)
+
+    single, repeated, batch, after_batch, titles = asyncio.run(run())
+    assert single["status"] == "success"
+    assert single["topic"]["topic"] == TITLES[0]
+    assert repeated["status"] == "error"
+    assert [result["status"] for result in batch] == ["error", "success"]
+    assert after_batch["status"] == "error"
+    assert titles == set(TITLES[:2])
@@ -0,0 +1,28 @@
+import pytest
+from app.utils import text_chunker
+from app.utils.text_chunker import TextChunker
+
+TEXTS = {
+    "one_long_token": "a" * 50000,
+    "long_tokens_between_sentences": (
+        "Short opening sentence. " + "b" * 3000 + " trailing words. " + "c" * 2500 + " Last one here."
+    ),
+    "long_token_after_newline": "First sentence.\n" + "d" * 4000 + ". Closing sentence.",
+    "paragraphs": "\n\n".join("A sentence about batteries. Another about solar cells." for _ in range(200)),
+}
+
+def chunks(text: str, block_chars: int, monkeypatch) -> list:
+    monkeypatch.setattr(text_chunker, "STREAM_BLOCK_CHARS", block_chars)
+    return list(TextChunker.iter_chunks(text, max_tokens=64, overlap=4, mode="regex"))
+
+@pytest.mark.parametrize("name", sorted(TEXTS))
+def test_streaming_blocks_match_single_pass(name, monkeypatch):
+    text = TEXTS[name]
+    assert chunks(text, 1000, monkeypatch) == chunks(text, len(text) + 1, monkeypatch)
+
+def test_split_blocks_never_cut_a_token():
+    text = "x" * 2500 + " tail " + "y" * 10
+    blocks = list(TextChunker._split_blocks(text, 1000))
+    assert "".join(blocks) == text
+    assert blocks[0] == "x" * 2500 + " "
+    assert all(block[-1].isspace() for block in blocks[:-1])
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from app.api.topic_api import router
+from app.benchmarks.fakes import HashEmbeddingService
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService
+from app.services.qdrant_service import QdrantService
+
+ENCODE_LATENCY = 0.2
+CONCURRENT_REQUESTS = 8
+
+class SlowModel:
+    """SentenceTransformer stand-in that blocks its thread for a fixed time per encode."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.hashes = HashEmbeddingService()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.hashes.dimension
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, normalize_embeddings=True) -> np.ndarray:
+        time.sleep(self.latency)
+        return self.hashes.encode_many(texts)
+
+def make_app(monkeypatch) -> FastAPI:
+    # One encode thread per request, so the test measures whether requests overlap at all
+    monkeypatch.setattr(embedding_module, "EMBEDDING_WORKERS", CONCURRENT_REQUESTS)
+    embedding_service = EmbeddingService()
+    embedding_service._model = SlowModel(ENCODE_LATENCY)
+    app = FastAPI()
+    app.include_router(router)
+    app.state.topic_service = SimpleNamespace(
+        qdrant_service=QdrantService(embedding_service, backend="memory")
+    )
+    return app
+
+def test_concurrent_ask_question_calls_do_not_serialize(monkeypatch):
+    app = make_app(monkeypatch)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Create the collection first so only the questions are timed
+            await app.state.topic_service.qdrant_service.warm_up()
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post("/api/v1/topics/ask-question", json={"query": f"question number {i}"})
+                for i in range(CONCURRENT_REQUESTS)
+            ))
+            return responses, time.perf_counter() - started
+
+    responses, elapsed = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
+    assert all(response.json()["message"] == "No relevant topics found." for response in responses)
+    assert elapsed < CONCURRENT_REQUESTS * ENCODE_LATENCY / 3
@@ -0,0 +1,195 @@
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from ..config import HTML_EXTRACTOR
+
+# Elements dropped before extraction and elements whose text forms the page content
+UNWANTED_TAGS = ('script', 'style', 'header', 'footer', 'nav')
+CONTENT_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+HEADING_TAGS = CONTENT_TAGS[1:]
+# Start tags that implicitly close an open <p>, as in the HTML parsing algorithm
+P_CLOSING_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'header', 'hr', 'li', 'main', 'menu', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'ul', *HEADING_TAGS
+))
+
+_WHITESPACE = re.compile(r'\s+')
+_UNWANTED_CHARS = re.compile(r'[^\w\s.,!?-]')
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+def _clean(text: str) -> str:
+    """Remove excessive whitespace and unwanted special characters."""
+    text = _WHITESPACE.sub(' ', text)
+    text = _UNWANTED_CHARS.sub('', text)
+    return text.strip()
+
+def extract_with_bs4(html: str) -> Tuple[str, List[str]]:
+    """Reference extractor: a full BeautifulSoup tree built with html.parser."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for element in soup(list(UNWANTED_TAGS)):
+        element.decompose()
+
+    main_content = soup.find('main') or soup.find('article') or soup.find('body')
+    if main_content:
+        content_elements = main_content.find_all(list(CONTENT_TAGS))
+        text = ' '.join([elem.get_text(strip=True) for elem in content_elements])
+    else:
+        text = soup.get_text(strip=True)
+
+    tables = [table.get_text(separator=" ", strip=True) for table in soup.find_all('table')]
+    return _clean(text), tables
+
+def extract_with_lxml(html: str) -> Tuple[str, List[str]]:
+    """libxml2-backed extractor; collects content blocks and tables in one walk of the tree."""
+    from lxml import etree, html as lxml_html
+
+    try:
+        # lxml refuses str input that declares an encoding, which XHTML pages often do
+        root = lxml_html.document_fromstring(_XML_DECLARATION.sub('', html, count=1))
+    except (ValueError, etree.ParserError):
+        # e.g. an empty or comment-only document, which bs4 handles
+        return extract_with_bs4(html)
+    etree.strip_elements(root, etree.Comment, etree.ProcessingInstruction, *UNWANTED_TAGS, with_tail=False)
+
+    main_content = root.find('.//main')
+    if main_content is None:
+        main_content = root.find('.//article')
+    if main_content is None:
+        main_content = root.find('.//body')
+
+    def strings(element) -> List[str]:
+        return [s.strip() for s in element.itertext() if s.strip()]
+
+    blocks = []
+    tables = []
+    for element in root.iter(*CONTENT_TAGS, 'table'):
+        if element.tag == 'table':
+            tables.append(' '.join(strings(element)))
+        elif main_content is not None and _is_within(element, main_content):
+            blocks.append(''.join(strings(element)))
+
+    text = ' '.join(blocks) if main_content is not None else ''.join(strings(root))
+    return _clean(text), tables
+
+def _is_within(element, ancestor) -> bool:
+    while element is not None:
+        if element is ancestor:
+            return True
+        element = element.getparent()
+    return False
+
+class _StreamingExtractor(HTMLParser):
+    """SAX-style pass that never builds a tree; text is routed to open blocks as it arrives."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.container_depth = {'main': 0, 'article': 0, 'body': 0}
+        self.seen_container = {'main': False, 'article': False, 'body': False}
+        self.open_blocks: List[Tuple[str, Tuple[Dict[str, bool], List[str]]]] = []
+        self.blocks: List[Tuple[Dict[str, bool], List[str]]] = []
+        self.open_tables: List[List[str]] = []
+        self.tables: List[List[str]] = []
+        self.all_strings: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if not self.skip_depth:
+            self._close_implied_blocks(tag)
+        if tag in UNWANTED_TAGS:
+            self.skip_depth += 1
+        if self.skip_depth:
+            return
+        if tag in self.container_depth:
+            self.container_depth[tag] += 1
+            self.seen_container[tag] = True
+        elif tag in CONTENT_TAGS:
+            inside = {name: depth > 0 for name, depth in self.container_depth.items()}
+            block = (inside, [])
+            self.open_blocks.append((tag, block))
+            self.blocks.append(block)
+        elif tag == 'table':
+            table = []
+            self.open_tables.append(table)
+            self.tables.append(table)
+
+    def handle_endtag(self, tag):
+        if tag in UNWANTED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+        if tag in self.container_depth:
+            self.container_depth[tag] = max(0, self.container_depth[tag] - 1)
+        elif tag in CONTENT_TAGS:
+            self._close_block(tag)
+        elif tag == 'table' and self.open_tables:
+            self.open_tables.pop()
+
+    def _close_implied_blocks(self, tag):
+        """Close blocks that a browser would end before this start tag, such as an unclosed <p>."""
+        if not self.open_blocks:
+            return
+        if tag in P_CLOSING_TAGS:
+            self._close_block('p')
+        if tag in HEADING_TAGS and self.open_blocks and self.open_blocks[-1][0] in HEADING_TAGS:
+            self.open_blocks.pop()
+
+    def _close_block(self, tag):
+        """Close the innermost open block with this tag and any blocks still open inside it."""
+        for index in range(len(self.open_blocks) - 1, -1, -1):
+            if self.open_blocks[index][0] == tag:
+                del self.open_blocks[index:]
+                return
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        stripped = data.strip()
+        if not stripped:
+            return
+        self.all_strings.append(stripped)
+        for _, (_, parts) in self.open_blocks:
+            parts.append(stripped)
+        for table in self.open_tables:
+            table.append(stripped)
+
+def extract_streaming(html: str) -> Tuple[str, List[str]]:
+    """Single-pass extractor built on the stdlib tokenizer; needs no extra dependency."""
+    parser = _StreamingExtractor()
+    parser.feed(html)
+    parser.close()
+
+    container = next((name for name in ('main', 'article', 'body') if parser.seen_container[name]), None)
+    if container is not None:
+        text = ' '.join(''.join(parts) for inside, parts in parser.blocks if inside[container])
+    else:
+        text = ''.join(parser.all_strings)
+
+    tables = [' '.join(table) for table in parser.tables]
+    return _clean(text), tables
+
+EXTRACTORS: Dict[str, Callable[[str], Tuple[str, List[str]]]] = {
+    'bs4': extract_with_bs4,
+    'lxml': extract_with_lxml,
+    'stream': extract_streaming,
+}
+
+def _default_backend() -> str:
+    if HTML_EXTRACTOR != 'auto':
+        return HTML_EXTRACTOR
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'bs4'
+
+def extract_html(html: str, backend: Optional[str] = None) -> Tuple[str, List[str]]:
+    """Return (text, tables) for an HTML document using the selected backend."""
+    backend = backend or _default_backend()
+    if backend not in EXTRACTORS:
+        raise ValueError(f"Unknown HTML extractor '{backend}', expected one of {list(EXTRACTORS)}")
+    return EXTRACTORS[backend](html)
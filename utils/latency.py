@@ -0,0 +1,37 @@
+import threading
+from collections import deque
+from typing import Dict
+
+class LatencyStats:
+    """Thread-safe request latency tracker keeping totals and a window of recent samples."""
+
+    def __init__(self, window: int = 1024):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def stats(self) -> Dict[str, float]:
+        """Return the sample count, mean and recent p50/p99 latencies in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self.count
+            total = self.total
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+        return {
+            "count": count,
+            "mean_ms": total / count * 1000 if count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99)
+        }
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from ..config import METRICS_DIR
+
+# Upper bounds in seconds, spanning cache hits (sub-millisecond) to long LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _label_values(labelnames: Sequence[str], labels: Dict[str, str]) -> Tuple[str, ...]:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {list(labelnames)}, got {list(labels)}")
+    return tuple(str(labels[name]).replace('\\', '\\\\').replace('"', '\\"') for name in labelnames)
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_values(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in sorted(self._values.items())]
+
+    def render(self, snapshots: Dict[str, list]) -> List[str]:
+        """Render each process's snapshot, labelled with its pid."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for pid, values in sorted(snapshots.items()):
+            extra = f'pid="{pid}"'
+            for key, value in values:
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key, extra)} {value}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (the last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_values(self.labelnames, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(counts), total] for key, (counts, total) in sorted(self._values.items())]
+
+    def render(self, snapshots: Dict[str, list]) -> List[str]:
+        """Render each process's snapshot, labelled with its pid."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for pid, values in sorted(snapshots.items()):
+            extra = f'pid="{pid}"'
+            for key, counts, total in values:
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.labelnames, key, extra + ',le="' + le + '"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key, extra)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key, extra)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide set of metrics, rendered in the Prometheus text exposition format.
+
+    Every series is labelled with the pid of the process that recorded it.
+    Under gunicorn each worker has its own registry, so with a directory set
+    every worker writes its values there (see write) and a scrape answered by
+    any worker renders all of them.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def snapshot(self) -> Dict[str, list]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def write(self, directory: str = METRICS_DIR) -> None:
+        """Save this process's values as <pid>.json in the directory, for the other workers to render."""
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.snapshot(), f)
+        # Atomic, so a reader never sees a half-written file
+        os.replace(path + ".tmp", path)
+
+    def _read_all(self, directory: str) -> Dict[str, Dict[str, list]]:
+        snapshots = {}
+        for name in os.listdir(directory):
+            pid, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    snapshots[pid] = json.load(f)
+            except (OSError, ValueError) as e:
+                # The worker exited and its file was removed meanwhile
+                logging.debug(f"Skipping metrics file {name}: {str(e)}")
+        return snapshots
+
+    def render(self, directory: Optional[str] = METRICS_DIR) -> str:
+        """Render this process's metrics, plus those every other worker last wrote to the directory."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshots = self._read_all(directory) if directory else {}
+        snapshots[str(os.getpid())] = self.snapshot()
+        return "\n".join(
+            line for metric in metrics
+            for line in metric.render({pid: snapshot.get(metric.name, []) for pid, snapshot in snapshots.items()})
+        ) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "topic_engine_stage_seconds", "Time spent in each pipeline stage", ("stage",)
+)
+SEGMENTS = REGISTRY.counter(
+    "topic_engine_segments_total", "Text segments sent for topic extraction", ("source",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "topic_engine_cache_requests_total", "Cache lookups by cache and outcome", ("cache", "result")
+)
+
+# Per-request stage totals; set by collect_timings and shared with the tasks and threads it spawns
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add a stage duration to the histogram and to the current request's breakdown."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one span of a pipeline stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """Collect the stage durations recorded by this context into a dict of stage -> seconds.
+
+    Tasks and asyncio.to_thread calls started inside inherit the dict, so
+    concurrent spans (e.g. parallel LLM calls) are summed and a stage can
+    exceed the wall time. Plain executor submissions don't carry the context.
+    """
+    timings: Dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
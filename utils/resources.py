@@ -0,0 +1,18 @@
+import os
+import resource
+import sys
+
+def current_rss_bytes() -> int:
+    """Return the current resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs (e.g. macOS): fall back to the peak, which is the best we have
+        return peak_rss_bytes()
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
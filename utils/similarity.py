@@ -0,0 +1,26 @@
+import numpy as np
+from typing import List, Sequence
+
+def suppress_near_duplicates(vectors: np.ndarray, scores: Sequence[float], threshold: float) -> List[int]:
+    """Greedy near-duplicate suppression over unit-normalized row vectors.
+
+    Candidates are visited from highest to lowest score (ties keep input
+    order); each kept candidate suppresses every remaining candidate whose
+    cosine similarity to it is at least threshold. Returns the kept indices
+    in input order.
+    """
+    count = len(vectors)
+    if count == 0:
+        return []
+
+    similarity = vectors @ vectors.T
+    # Stable sort so equal scores fall back to input order
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
+    suppressed = np.zeros(count, dtype=bool)
+    kept = []
+    for i in order:
+        if suppressed[i]:
+            continue
+        kept.append(i)
+        suppressed |= similarity[i] >= threshold
+    return sorted(int(i) for i in kept)
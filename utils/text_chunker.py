@@ -1,30 +1,170 @@
-import spacy
-from typing import List
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .metrics import timed
+from ..config import CHUNKER_MODE, SPACY_MODEL, STREAM_BLOCK_CHARS
+
+# Chunking modes, from most to least accurate sentence boundaries:
+#   transformer - the full spaCy model with only transformer + parser enabled
+#   sentencizer - a blank English pipeline with the rule-based sentencizer
+#   regex       - no model at all; punctuation-based sentences and regex token counts
+CHUNKER_MODES = ("transformer", "sentencizer", "regex")
+
+# Components the chunker needs from the full model; the parser sets sentence boundaries
+_REQUIRED_COMPONENTS = ("transformer", "tok2vec", "parser", "senter")
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_THROUGH_LAST_WHITESPACE = re.compile(r'.*\s', re.DOTALL)
+_WHITESPACE_CHAR = re.compile(r'\s')
+
+_pipelines: Dict[str, object] = {}
+_pipelines_lock = threading.Lock()
+
+def get_pipeline(mode: str = CHUNKER_MODE):
+    """Return the shared spaCy pipeline for a chunking mode, loading it on first use."""
+    if mode not in ("transformer", "sentencizer"):
+        raise ValueError(f"Chunking mode '{mode}' does not use a spaCy pipeline")
+
+    nlp = _pipelines.get(mode)
+    if nlp is not None:
+        return nlp
+    with _pipelines_lock:
+        if mode not in _pipelines:
+            import spacy
+            if mode == "transformer":
+                nlp = spacy.load(SPACY_MODEL)
+                nlp.select_pipes(disable=[
+                    name for name in nlp.pipe_names if name not in _REQUIRED_COMPONENTS
+                ])
+            else:
+                nlp = spacy.blank("en")
+                nlp.add_pipe("sentencizer")
+            _pipelines[mode] = nlp
+        return _pipelines[mode]
 
 class TextChunker:
     @staticmethod
-    def chunk_text_using_spacy(text: str, max_tokens: int = 512, overlap: int = 10) -> List[str]:
-        """Split text into chunks of specified size using SpaCy while preserving sentence boundaries."""
-        nlp = spacy.load("en_core_web_trf")
-        doc = nlp(text)
-        sentences = [sent.text for sent in doc.sents]
+    def _split_blocks(text: str, max_chars: int) -> Iterator[str]:
+        """Split text into blocks below max_chars, preferring paragraph breaks.
+
+        Blocks only end at whitespace, since the caller joins them with a space.
+        A token longer than max_chars is carried whole into one oversized block.
+        """
+        start = 0
+        length = len(text)
+        while start < length:
+            end = min(start + max_chars, length)
+            if end < length:
+                # Back off to the last paragraph break, or failing that any whitespace
+                match = None
+                for match in _PARAGRAPH_BREAK.finditer(text, start, end):
+                    pass
+                if match is not None and match.end() > start:
+                    end = match.end()
+                else:
+                    match = _THROUGH_LAST_WHITESPACE.match(text, start, end)
+                    if match is not None and match.end() > start:
+                        end = match.end()
+                    else:
+                        # No break in this block: extend it to the end of the unfinished token
+                        match = _WHITESPACE_CHAR.search(text, end)
+                        end = match.end() if match is not None else length
+            yield text[start:end]
+            start = end
+
+    @staticmethod
+    def _parse_sentences(text: str, mode: str) -> List[Tuple[str, List[str]]]:
+        """Return (sentence, tokens) pairs for one segment, tokenizing each sentence exactly once."""
+        with timed("chunking"):
+            return TextChunker._parse_segment(text, mode)
+
+    @staticmethod
+    def _parse_segment(text: str, mode: str) -> List[Tuple[str, List[str]]]:
+        if mode == "regex":
+            sentences = []
+            for sentence in _SENTENCE_BOUNDARY.split(text):
+                sentence = sentence.strip()
+                if sentence:
+                    sentences.append((sentence, _TOKEN.findall(sentence)))
+            return sentences
+
+        doc = get_pipeline(mode)(text)
+        return [(sent.text, [token.text for token in sent]) for sent in doc.sents]
 
-        chunks = []
+    @staticmethod
+    def _iter_sentences(segments: Iterable[str], mode: str) -> Iterator[Tuple[str, List[str]]]:
+        """Yield sentences from a stream of text segments.
+
+        A segment may end mid-sentence (page breaks, block splits), so the last
+        sentence of each segment is held back and re-parsed with the next one.
+        """
+        carry = ""
+        for segment in segments:
+            text = f"{carry} {segment}" if carry else segment
+            sentences = TextChunker._parse_sentences(text, mode)
+            if not sentences:
+                carry = ""
+                continue
+            yield from sentences[:-1]
+            last = sentences[-1]
+            if len(last[0]) < STREAM_BLOCK_CHARS:
+                carry = last[0]
+            else:
+                # Don't let a single runaway sentence grow the carry without bound
+                carry = ""
+                yield last
+        if carry:
+            yield from TextChunker._parse_sentences(carry, mode)
+
+    @staticmethod
+    def _iter_segments(source: Union[str, Iterable[str]]) -> Iterator[str]:
+        """Yield bounded-size segments from a text or an iterator of page texts."""
+        pages = [source] if isinstance(source, str) else source
+        for page in pages:
+            if page:
+                yield from TextChunker._split_blocks(page, STREAM_BLOCK_CHARS)
+
+    @staticmethod
+    def iter_chunks(
+        source: Union[str, Iterable[str]],
+        max_tokens: int = 512,
+        overlap: int = 10,
+        mode: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield chunks as soon as they close, keeping memory bounded by the segment size.
+
+        Accepts either a full text or an iterator of page texts, which is consumed lazily.
+        """
+        mode = mode or CHUNKER_MODE
+        if mode not in CHUNKER_MODES:
+            raise ValueError(f"Unknown chunking mode '{mode}', expected one of {CHUNKER_MODES}")
+        sentences = TextChunker._iter_sentences(TextChunker._iter_segments(source), mode)
+        return TextChunker._assemble_chunks(sentences, max_tokens, overlap)
+
+    @staticmethod
+    def _assemble_chunks(
+        sentences: Iterable[Tuple[str, List[str]]],
+        max_tokens: int,
+        overlap: int
+    ) -> Iterator[str]:
+        """Pack sentences into chunks of at most max_tokens, splitting overlong sentences."""
         current_chunk = []
         current_token_count = 0
 
-        for sentence in sentences:
-            sentence_doc = nlp(sentence)
-            sentence_tokens = [token.text for token in sentence_doc]
+        for sentence, sentence_tokens in sentences:
             num_tokens_in_sentence = len(sentence_tokens)
 
             if num_tokens_in_sentence > max_tokens:
+                # Close the pending chunk first so its sentences aren't lost
+                if current_chunk:
+                    yield " ".join(current_chunk)
                 # If the sentence itself is longer than max_tokens, split it into chunks
                 start = 0
                 end = max_tokens
                 while start < num_tokens_in_sentence:
-                    chunk = " ".join(sentence_tokens[start:end])
-                    chunks.append(chunk)
+                    yield " ".join(sentence_tokens[start:end])
                     start += max_tokens - overlap
                     end = min(start + max_tokens, num_tokens_in_sentence)
                 current_chunk = []
@@ -33,7 +173,7 @@ class TextChunker:
 
             if current_token_count + num_tokens_in_sentence > max_tokens:
                 # If adding this sentence exceeds max_tokens, finalize the current chunk
-                chunks.append(" ".join(current_chunk))
+                yield " ".join(current_chunk)
                 current_chunk = []
                 current_token_count = 0
 
@@ -41,11 +181,19 @@ class TextChunker:
             current_token_count += num_tokens_in_sentence
 
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
+            yield " ".join(current_chunk)
 
-        return chunks
+    @staticmethod
+    def chunk_text_using_spacy(
+        text: str,
+        max_tokens: int = 512,
+        overlap: int = 10,
+        mode: Optional[str] = None
+    ) -> List[str]:
+        """Split text into chunks of specified size using SpaCy while preserving sentence boundaries."""
+        return list(TextChunker.iter_chunks(text, max_tokens, overlap, mode))
 
     @staticmethod
-    def chunk_text(text: str, chunk_size: int = 1000) -> List[str]:
+    def chunk_text(text: str, chunk_size: int = 1000, mode: Optional[str] = None) -> List[str]:
         """Use the SpaCy chunking method instead of the traditional method."""
-        return TextChunker.chunk_text_using_spacy(text, max_tokens=chunk_size)
\ No newline at end of file
+        return TextChunker.chunk_text_using_spacy(text, max_tokens=chunk_size, mode=mode)